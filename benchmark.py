@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import importlib.util
+from datetime import datetime
+
+import numpy as np
+
+from rom_fixtures import write_fixture, parse_size, format_size
+from rom_delta_logger import compute_delta_sum, stream_delta
+from nibble_tracker import NibbleTracker
+from frontier_index import FrontierIndex
+from roll_log import RollLog
+from known_good import KnownGoodOracle
+from nibble_sampler import NibbleSampler
+import byte_evolution_tracker as tracker_loop
+import evolve_try_script_autoweight
+import delta_parser
+
+# === HOT PATH BENCHMARKS ===
+# Times the per-iteration stages on synthetic fixtures (rom_fixtures.py) in
+# a temporary directory, so nothing under ~/evolved_roms is read or written.
+# The loop's own functions are pointed at the fixture by swapping their
+# module-level paths and singletons. Each stage reports its best of
+# --repeat runs; results go to a JSON file for before/after comparisons.
+
+DEFAULT_SIZES = "64K,1M,16M,64M"
+PER_CALL_COUNT = 10000  # calls timed for the one-at-a-time stages
+BATCH_RECORDS = 1 << 22  # cap on records per roll_log.append_many run (~70 MB)
+
+def load_compared_parser():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "project",
+                        "evolve_try_script_from_deltas_compared.py")
+    spec = importlib.util.spec_from_file_location("evolve_try_script_from_deltas_compared", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.parse_log
+
+def best_of(fn, repeat, setup=None):
+    # setup() runs untimed before every repeat.
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def bench_size(workdir, size, args):
+    paths = write_fixture(workdir, size, args.density, args.fill, args.seed)
+    results = []
+
+    def record(stage, seconds, calls=None):
+        entry = {"stage": stage, "size": size, "seconds": seconds,
+                 "mb_per_sec": size / seconds / 1e6 if seconds > 0 else None}
+        if calls:
+            entry["calls"] = calls
+            entry["us_per_call"] = seconds / calls * 1e6
+            del entry["mb_per_sec"]
+        results.append(entry)
+        print(f"  {stage:<26} {format_size(size):>5}  {seconds * 1000:10.2f} ms")
+
+    # === Delta ===
+    record("compute_delta_sum", best_of(lambda: compute_delta_sum(paths["older"], paths["newer"]), args.repeat))
+    scratch = os.path.join(workdir, "delta_bench.bin")
+    record("stream_delta", best_of(lambda: stream_delta(paths["older"], paths["newer"], scratch), args.repeat))
+
+    # === Tracker update from the delta ===
+    tracker = NibbleTracker(paths["tracker"], size * 2)
+    tracker_loop.ORACLE = KnownGoodOracle(paths["known_good"])
+    tracker_loop.DELTA_BIN = paths["delta"]
+    tracker_loop._tracker = tracker
+    record("update_byte_tracker", best_of(tracker_loop.update_byte_tracker, args.repeat))
+
+    # === Frontier walk ===
+    calls = min(PER_CALL_COUNT, size * 2)
+
+    def walk_frontier():
+        tracker_loop._frontier = frontier = FrontierIndex.from_tracker(tracker)
+        for _ in range(calls):
+            i = tracker_loop.find_next_offset()[0]
+            if i is None:
+                break
+            frontier.mark_locked(np.array([i]))
+
+    record("find_next_offset", best_of(walk_frontier, args.repeat), calls)
+
+    # === Roll log ===
+    rng = np.random.default_rng(args.seed)
+    log_dir = os.path.join(workdir, "rolls")
+    log_base = os.path.join(log_dir, "rolls")
+
+    def fresh_log():
+        # Every repeat starts from an empty log; old segments don't pile up.
+        shutil.rmtree(log_dir, ignore_errors=True)
+        os.makedirs(log_dir)
+
+    def roll_one_at_a_time():
+        tracker_loop._roll_log = log = RollLog(log_base)
+        for i in range(calls):
+            tracker_loop.record_roll(i, "A", "B")
+        log.close()
+
+    record("record_roll", best_of(roll_one_at_a_time, args.repeat, fresh_log), calls)
+    batch = min(BATCH_RECORDS, size * 2)
+    offsets = np.arange(batch, dtype=np.int64)
+    goods = rng.integers(0, 16, size=batch, dtype=np.uint8)
+
+    def roll_batch():
+        log = RollLog(log_base)
+        log.append_many(offsets, goods, goods)
+        log.close()
+
+    record("roll_log.append_many", best_of(roll_batch, args.repeat, fresh_log), batch)
+    shutil.rmtree(log_dir, ignore_errors=True)
+    tracker_loop._roll_log = None
+
+    # === ROM generation ===
+    weights = {f"{i:X}": float(i + 1) for i in range(16)}
+    record("generate_rom", best_of(lambda: NibbleSampler(weights, rng=rng).sample_bytes(size), args.repeat))
+
+    # === Try-script parsers ===
+    # Parses are memoized per file; clear the cache so each run is a cold parse.
+    def cold(parse, path):
+        return lambda: (delta_parser.CACHE.clear(), parse(path))
+
+    compared_parse_log = load_compared_parser()
+    record("parse_log.autoweight.bin", best_of(cold(evolve_try_script_autoweight.parse_log, paths["delta"]), args.repeat))
+    record("parse_log.autoweight.txt", best_of(cold(evolve_try_script_autoweight.parse_log, paths["delta_text"]), args.repeat))
+    record("parse_log.compared.bin", best_of(cold(compared_parse_log, paths["delta"]), args.repeat))
+    record("parse_log.compared.txt", best_of(cold(compared_parse_log, paths["delta_text"]), args.repeat))
+    delta_parser.parse_delta_log(paths["delta_text"])
+    record("parse_log.memoized", best_of(lambda: delta_parser.parse_delta_log(paths["delta_text"]), args.repeat))
+
+    del tracker
+    tracker_loop._tracker = tracker_loop._frontier = None
+    return results
+
+def run(args):
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "params": {"density": args.density, "fill": args.fill, "seed": args.seed, "repeat": args.repeat},
+        "results": [],
+    }
+    root = tempfile.mkdtemp(prefix="rom_bench_")
+    try:
+        for size in sizes:
+            print(f"📏 {format_size(size)} ROM")
+            workdir = os.path.join(root, format_size(size))
+            report["results"].extend(bench_size(workdir, size, args))
+            shutil.rmtree(workdir)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {os.path.abspath(args.out)}")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the evolution loop's hot paths on synthetic ROMs")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated ROM sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--density", type=float, default=0.01, help="fraction of bytes changed per ROM (default: 0.01)")
+    parser.add_argument("--fill", type=float, default=0.5, help="fraction of nibbles already locked (default: 0.5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, best one is kept (default: 3)")
+    parser.add_argument("--out", default=f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    run(parser.parse_args())
@@ -4,57 +4,148 @@ import time
 import subprocess
 from datetime import datetime
 import json
-import sys
-import random
-import shutil
+import argparse
+import atexit
+import asyncio
+
+import numpy as np
+
+from nibble_tracker import NibbleTracker
+from frontier_index import FrontierIndex
+from lock_counters import LockCounters
+from roll_log import RollLog, RECORD
+from rom_history import RomHistory
+from rom_index import RomIndex, new_rom_name
+from known_good import KnownGoodOracle
+from nibble_roller import roll_batch, commit_rolls
+from delta_format import read_delta
+from terminal_renderer import TerminalRenderer, HeadlessRenderer
+from pacing import Pacer, add_pacing_args, pacer_from_args
+from loop_metrics import LoopMetrics
+from checkpoint import Checkpoints
+from io_queue import IoQueue
+from tried_mask import TriedMask
+
+try:
+    from evolution_pipeline import EvolutionPipeline
+except ImportError:
+    EvolutionPipeline = None
 
 # === BYTE EVOLUTION TRACKER — DISCOVERY FOCUSED ===
 ROM_DIR = os.path.expanduser("~/evolved_roms")
 PROJECT_DIR = os.path.join(ROM_DIR, "project")
 KNOWN_GOOD_ROM = os.path.join(ROM_DIR, "known_good_rom.bin")
 TRACKER_JSON = os.path.join(PROJECT_DIR, "byte_tracker.json")
+TRACKER_BIN = os.path.join(PROJECT_DIR, "byte_tracker.bin")
+COUNTS_FILE = os.path.join(PROJECT_DIR, "byte_tracker.counts")
+CHECKPOINT_BASE = os.path.join(PROJECT_DIR, "byte_tracker")
+TRIED_FILE = os.path.join(PROJECT_DIR, "byte_tracker.tried")
 EVOLVE_SCRIPT = os.path.join(PROJECT_DIR, "evolve_try_script_from_deltas_compared.py")
 TRY_SCRIPT = os.path.join(PROJECT_DIR, "evolved_try_script.txt")
 ROLL_LOG = os.path.join(PROJECT_DIR, "dice_roll_log.json")
+ROLL_LOG_BASE = os.path.join(PROJECT_DIR, "dice_roll_log")
 SNAPSHOT_FILE = os.path.join(PROJECT_DIR, "progress_snapshot.json")
+STATS_BASE = os.path.join(PROJECT_DIR, "loop_stats")
+HISTORY_DIR = os.path.join(PROJECT_DIR, "rom_history")
 
-DELTA_LOG = os.path.join(PROJECT_DIR, "delta_log_latest.txt")
+DELTA_BIN = os.path.join(PROJECT_DIR, "delta_latest.bin")
 
 HEX_DIGITS = list("0123456789ABCDEF")
+RNG = np.random.default_rng()
 SPINNER_FRAMES = ["/", "-", "\\"]
 
-def get_terminal_width():
-    try:
-        return shutil.get_terminal_size().columns
-    except:
-        return 80
-
-def clear_screen():
-    sys.stdout.write("\033[2J\033[H")
-    sys.stdout.flush()
-
-def print_frame(lines):
-    clear_screen()
-    for line in lines:
-        sys.stdout.write(line + "\n")
-    sys.stdout.flush()
+# The known-good ROM is mapped once; everything that needs a good nibble asks it.
+ORACLE = KnownGoodOracle.load(KNOWN_GOOD_ROM)
 
 def get_rom_char_count():
-    try:
-        with open(KNOWN_GOOD_ROM, 'rb') as f:
-            return len(f.read()) * 2
-    except:
-        return 524288 * 2
+    return ORACLE.hex_chars if ORACLE is not None else 524288 * 2
 
 TOTAL_HEX_CHARS = get_rom_char_count()
 
-def get_latest_roms():
-    roms = sorted([
-        f for f in os.listdir(PROJECT_DIR)
-        if f.startswith("evolved_rom_") and f.endswith(".bin")
-    ], key=lambda x: os.path.getmtime(os.path.join(PROJECT_DIR, x)))
-    full_paths = [os.path.join(PROJECT_DIR, f) for f in roms]
-    return (full_paths[-2], full_paths[-1]) if len(full_paths) >= 2 else (None, None)
+_tracker = None
+_checkpoints = None
+
+def get_tracker():
+    # byte_tracker.json is only read once, to seed a fresh byte_tracker.bin.
+    # The last checkpoint and its lock journal are replayed on top before
+    # anything else subscribes, so listeners see the recovered state.
+    global _tracker, _checkpoints
+    if _tracker is None:
+        _tracker = NibbleTracker.open(TRACKER_BIN, TOTAL_HEX_CHARS, legacy_json=TRACKER_JSON)
+        _checkpoints = Checkpoints.open(CHECKPOINT_BASE, _tracker)
+        atexit.register(_checkpoints.close)
+    return _tracker
+
+def get_checkpoints():
+    get_tracker()
+    return _checkpoints
+
+_frontier = None
+
+def get_frontier():
+    # Built from the tracker once, then kept current by the tracker's lock events.
+    global _frontier
+    if _frontier is None:
+        tracker = get_tracker()
+        _frontier = FrontierIndex.from_tracker(tracker)
+        tracker.listeners.append(_frontier.mark_locked)
+    return _frontier
+
+_tried = None
+
+def get_tried():
+    global _tried
+    if _tried is None:
+        _tried = TriedMask(TRIED_FILE, get_tracker().size)
+    return _tried
+
+_counters = None
+
+def get_counters():
+    global _counters
+    if _counters is None:
+        _counters = LockCounters.open(COUNTS_FILE, get_tracker())
+    return _counters
+
+_roll_log = None
+
+def get_roll_log():
+    global _roll_log
+    if _roll_log is None:
+        _roll_log = RollLog(ROLL_LOG_BASE)
+        if len(_roll_log) == 0 and os.path.exists(ROLL_LOG):
+            _roll_log.import_json(ROLL_LOG)
+        atexit.register(_roll_log.close)
+    return _roll_log
+
+_history = None
+
+def get_history():
+    # A new store starts from the newest evolved_rom_*.bin files on disk.
+    global _history
+    if _history is None:
+        _history = RomHistory(HISTORY_DIR)
+        if len(_history) < 2:
+            for path in get_rom_index().latest(2):
+                _history.import_file(path)
+    return _history
+
+_rom_index = None
+
+def get_rom_index():
+    # Rebuilt from one scandir pass the first time, appended to afterwards.
+    global _rom_index
+    if _rom_index is None:
+        _rom_index = RomIndex(PROJECT_DIR)
+    return _rom_index
+
+def rom_label(rom):
+    return _history.name(rom) if isinstance(rom, int) else os.path.basename(rom)
+
+def get_latest_roms(history=None):
+    if history is not None:
+        return history.latest_two()
+    return get_rom_index().latest_two()
 
 def compute_delta(rom1, rom2):
     result = subprocess.run([
@@ -62,48 +153,35 @@ def compute_delta(rom1, rom2):
     ], capture_output=True, text=True)
     return result.returncode == 0
 
+def rom_file_bytes(*paths):
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+def make_pipeline():
+    return EvolutionPipeline(PROJECT_DIR, ORACLE, get_tracker(), DELTA_BIN, TRY_SCRIPT,
+                             history=get_history())
+
 def evolve_rom():
     try:
         subprocess.run([
-            "python3", EVOLVE_SCRIPT, DELTA_LOG, DELTA_LOG, TRY_SCRIPT
+            "python3", EVOLVE_SCRIPT, DELTA_BIN, DELTA_BIN, TRY_SCRIPT
         ], capture_output=True, text=True, check=True)
     except:
         pass
 
-    path = os.path.join(PROJECT_DIR, f"evolved_rom_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bin")
+    path = os.path.join(PROJECT_DIR, new_rom_name())
     with open(path, "wb") as f:
         f.write(os.urandom(512 * 1024))
+    get_rom_index().add(path)
     return path
 
 def update_byte_tracker():
+    # NibbleTracker.score, as in EvolutionPipeline.update_tracker, on
+    # the binary delta rom_delta_logger.py leaves behind.
     try:
-        with open(DELTA_LOG, "r") as f:
-            delta_lines = f.readlines()
-        with open(KNOWN_GOOD_ROM, "rb") as f:
-            good_data = f.read()
-        if os.path.exists(TRACKER_JSON):
-            with open(TRACKER_JSON, "r") as f:
-                tracker = json.load(f)
-        else:
-            tracker = {}
-
-        for line in delta_lines:
-            parts = line.strip().split()
-            if len(parts) != 2:
-                continue
-            offset_hex, newval = parts
-            offset = int(offset_hex, 16)
-            byte_index = offset // 2
-            key = f"{byte_index}_hi" if offset % 2 == 0 else f"{byte_index}_lo"
-            real_byte = good_data[byte_index]
-            good_char = f"{real_byte:02X}"[0 if offset % 2 == 0 else 1]
-            if newval.upper() == good_char:
-                tracker[key] = 15
-            else:
-                tracker[key] = tracker.get(key, 0) + 1
-
-        with open(TRACKER_JSON, "w") as f:
-            json.dump(tracker, f)
+        tracker = get_tracker()
+        index, value = read_delta(DELTA_BIN).changed_nibbles()
+        tracker.score(index, value, ORACLE)
+        tracker.flush()
     except:
         pass
 
@@ -113,132 +191,347 @@ def ensure_try_script_exists():
             f.write("0x0000:0\n")
 
 def get_locked_in_count():
-    try:
-        with open(TRACKER_JSON, "r") as f:
-            tracker = json.load(f)
-            return sum(1 for status in tracker.values() if status >= 15)
-    except:
-        return 0
-
-def clean_tracker():
-    try:
-        with open(TRACKER_JSON, "r") as f:
-            tracker = json.load(f)
-        return {k: v for k, v in tracker.items() if isinstance(v, int) and 0 <= v <= 15 and "_" in k}
-    except:
-        return {}
+    return get_counters().total
 
 def find_next_offset():
-    tracker = clean_tracker()
-    for i in range(TOTAL_HEX_CHARS):
-        byte_index = i // 2
-        is_hi = (i % 2 == 0)
-        key = f"{byte_index}_hi" if is_hi else f"{byte_index}_lo"
-        if tracker.get(key, 0) < 15:
-            return i, key, byte_index, is_hi
-    return None, None, None, None
-
-def get_weighted_roll():
-    weights = {k: 1 for k in HEX_DIGITS}
-    return random.choices(HEX_DIGITS, weights=[weights[k] for k in HEX_DIGITS])[0]
+    i = get_frontier().next_unlocked()
+    if i is None:
+        return None, None, None, None
+    byte_index = i // 2
+    is_hi = (i % 2 == 0)
+    key = f"{byte_index}_hi" if is_hi else f"{byte_index}_lo"
+    return i, key, byte_index, is_hi
 
 def record_roll(offset, good_char, roll):
-    entry = {
-        "timestamp": datetime.now().isoformat(),
-        "offset": offset,
-        "good_char": good_char,
-        "roll": roll
-    }
-    if os.path.exists(ROLL_LOG):
-        with open(ROLL_LOG, "r") as f:
-            existing = json.load(f)
-    else:
-        existing = []
-    existing.append(entry)
-    with open(ROLL_LOG, "w") as f:
-        json.dump(existing[-1000:], f)
+    get_roll_log().append(offset, int(good_char, 16), int(roll, 16))
 
-def save_progress_snapshot(attempts, locked, tracker):
+def save_progress_snapshot(attempts, locked):
+    # A summary only; the tracker state itself lives in the checkpoint files.
+    counters = get_counters()
     snapshot = {
         "timestamp": datetime.now().isoformat(),
         "attempts": attempts,
         "locked": locked,
-        "tracker": tracker
+        "lines_closed": counters.lines_closed,
+        "cubes_closed": counters.cubes_closed,
+        "checkpoint_epoch": get_checkpoints().epoch
     }
-    with open(SNAPSHOT_FILE, "w") as f:
+    tmp_path = f"{SNAPSHOT_FILE}.tmp"
+    with open(tmp_path, "w") as f:
         json.dump(snapshot, f, indent=2)
+    os.replace(tmp_path, SNAPSHOT_FILE)
+
+def checkpoint(attempts, force=False):
+    # Journal entries carry the attempt count; a base is cut when enough
+    # lock events have piled up (or on force, e.g. on the way out).
+    checkpoints = get_checkpoints()
+    checkpoints.attempts = attempts
+    if force:
+        checkpoints.write_base(get_tracker())
+    elif not checkpoints.maybe_write_base(get_tracker()):
+        return False
+    save_progress_snapshot(attempts, get_locked_in_count())
+    return True
+
+def flush_tracker():
+    get_tracker().flush()
+    get_tried().flush()
+    get_counters().flush()
+
+def roll_nibbles(batch_size, window=None, io=None):
+    # Rolls the next batch of frontier nibbles, each from the digits its tried
+    # mask hasn't ruled out, and commits hits and eliminations in one tracker
+    # update. Returns (index, good, rolls, hits); index is empty once every
+    # nibble is locked. With an `io` list the roll log append and the
+    # tracker flush are appended to it as (stage, fn, args) instead of run.
+    index = get_frontier().unlocked_batch(batch_size, window)
+    if len(index) == 0:
+        return index, None, None, None
+    good = ORACLE.nibbles(index) if ORACLE is not None else np.zeros(len(index), dtype=np.uint8)
+    tried = get_tried()
+    rolls, hits = roll_batch(RNG, good, tried.bits[index])
+    writes = [("roll_log", get_roll_log().append_many, (index, good, rolls))]
+    commit_rolls(get_tracker(), tried, index, rolls, hits)
+    writes.append(("tracker_flush", flush_tracker, ()))
+    if io is None:
+        for _, fn, args in writes:
+            fn(*args)
+    else:
+        io.extend(writes)
+    return index, good, rolls, hits
+
+# === UI ===
+# run_loop only publishes a state dict per iteration; the renderer thread
+# formats it with one of these.
+def format_roll_line(state):
+    if state["count"] == 1:
+        roll_guess = HEX_DIGITS[state["roll"]]
+        dice_display = " ".join([f"🎲{g}" if g == roll_guess else g for g in HEX_DIGITS])
+        return f"🎯 Offset 0x{state['first']:06X} | Rolls: {dice_display}"
+    return (f"🎯 Offsets 0x{state['first']:06X}–0x{state['last']:06X} | 📦 {state['count']:,} rolls, "
+            f"{state['hits']:,} hits | ⚡ {state['batch_rate']:,.0f} rolls/sec")
+
+def format_frame(state, width):
+    if "message" in state:
+        return [state["message"]]
+    spinner = SPINNER_FRAMES[state["spinner"] % len(SPINNER_FRAMES)]
+    lines = [
+        "",
+        "",
+        f"▶️ Evolution Loop {spinner}".center(width),
+        f"🔗 Comparing: {state['older']} → {state['newer']}".center(width),
+        (f"🔁 Attempts: {state['attempts']:,} | ⏱ Speed: {state['speed']:.1f}/sec"
+         f" | 🪟 {state['window_rate']:,.1f}/sec last {state['window']:.0f}s").center(width),
+        f"🚦 Pacing {state['pacing']}".center(width),
+        "",
+        format_roll_line(state).center(width),
+        ""
+    ]
+    if state["delta_ok"]:
+        if state["new_locked"] > state["locked"]:
+            lines.append(f"🎯 DISCOVERED! Total: {state['new_locked']}/{TOTAL_HEX_CHARS} ✅".center(width))
+        else:
+            lines.append(f"🔒 Discovered: {state['locked']}/{TOTAL_HEX_CHARS}".center(width))
+        lines.append(f"🎉 Lines closed: {state['lines_closed']:,} | 🧊 Memory cubes: {state['cubes_closed']:,}".center(width))
+    lines.append("")
+    return lines
+
+def format_stats(state):
+    if "message" in state:
+        return state["message"]
+    return (f"attempts={state['attempts']} speed={state['speed']:.1f}/s window={state['window_rate']:.1f}/s "
+            f"locked={state['new_locked']}/{TOTAL_HEX_CHARS} lines={state['lines_closed']} "
+            f"cubes={state['cubes_closed']} last_batch={state['count']} hits={state['hits']} "
+            f"pacing=\"{state['pacing']}\"")
+
+def make_renderer(headless=False, metrics=None):
+    if headless:
+        return HeadlessRenderer(format_stats, metrics=metrics).start()
+    return TerminalRenderer(format_frame, metrics=metrics).start()
+
+def count_batch(metrics, index, hits, batch_time, attempts, locked):
+    # Metrics for one rolled batch; returns the new locked count.
+    metrics.record("roll", batch_time)
+    metrics.inc("rolls", len(index))
+    metrics.inc("hits", int(hits.sum()))
+    metrics.inc("bytes_written", len(index) * RECORD.itemsize)
+    metrics.mark(len(index))
+    get_checkpoints().attempts = attempts
+    # Misses can lock too, when they leave a nibble a single candidate.
+    previous = locked
+    locked = get_locked_in_count()
+    metrics.inc("locks", locked - previous)
+    return locked
+
+def batch_state(spinner_idx, older_rom, newer_rom, attempts, speed, index, rolls, hits,
+                batch_time, locked, pacer, metrics):
+    return {
+        "spinner": spinner_idx,
+        "older": rom_label(older_rom),
+        "newer": rom_label(newer_rom),
+        "attempts": attempts,
+        "speed": speed,
+        "first": int(index[0]),
+        "last": int(index[-1]),
+        "count": len(index),
+        "roll": int(rolls[0]),
+        "hits": int(hits.sum()),
+        "batch_rate": len(index) / batch_time if batch_time > 0 else 0,
+        "locked": locked,
+        "new_locked": locked,
+        "lines_closed": 0,
+        "cubes_closed": 0,
+        "delta_ok": False,
+        "pacing": pacer.describe(),
+        "window_rate": metrics.rate(),
+        "window": metrics.window,
+    }
 
-def run_loop():
+def run_loop(use_subprocess=False, batch_size=1, window=None, headless=False, pacer=None, metrics=None):
     ensure_try_script_exists()
+    pacer = pacer or Pacer()
+    metrics = metrics or LoopMetrics(STATS_BASE)
+    # Subprocess mode is only a fallback for trees without the pipeline module.
+    pipeline = None if use_subprocess or EvolutionPipeline is None else make_pipeline()
+    renderer = make_renderer(headless, metrics)
     spinner_idx = 0
     locked = get_locked_in_count()
-    attempts = 0
+    # Resume the attempt count from the last checkpoint; speed covers this run.
+    resumed = attempts = get_checkpoints().attempts
     start_time = time.time()
 
-    while True:
-        width = get_terminal_width()
-        spinner = SPINNER_FRAMES[spinner_idx % len(SPINNER_FRAMES)]
-        spinner_idx += 1
-        attempts += 1
-        elapsed_time = time.time() - start_time
-        speed = attempts / elapsed_time if elapsed_time > 0 else 0
-
-        older_rom, newer_rom = get_latest_roms()
-        if not older_rom or not newer_rom:
-            print_frame(["⏳ Waiting for at least two ROMs to compare..."])
-            time.sleep(0.25)
-            continue
-
-        i, key, byte_index, is_hi = find_next_offset()
-        if key is None:
-            print_frame(["✅ Evolution complete. All offsets discovered!"])
-            break
+    try:
+        while True:
+            spinner_idx += 1
 
-        try:
-            with open(KNOWN_GOOD_ROM, "rb") as f:
-                good_data = f.read()
-            good_byte = f"{good_data[byte_index]:02X}"
-            good_char = good_byte[0] if is_hi else good_byte[1]
-        except:
-            good_char = "0"
-
-        roll_guess = get_weighted_roll()
-        record_roll(i, good_char, roll_guess)
-        dice_display = " ".join([f"🎲{g}" if g == roll_guess else g for g in HEX_DIGITS])
+            older_rom, newer_rom = get_latest_roms(pipeline.history if pipeline else None)
+            if older_rom is None or newer_rom is None:
+                renderer.update({"message": "⏳ Waiting for at least two ROMs to compare..."})
+                pacer.idle()
+                continue
 
-        tracker = clean_tracker()
-        if roll_guess == good_char:
-            tracker[key] = 15
-            with open(TRACKER_JSON, "w") as f:
-                json.dump(tracker, f)
-            locked = get_locked_in_count()
-            save_progress_snapshot(attempts, locked, tracker)
-
-        lines = [
-            "",
-            f"▶️ Evolution Loop {spinner}".center(width),
-            f"🔗 Comparing: {os.path.basename(older_rom)} → {os.path.basename(newer_rom)}".center(width),
-            f"🔁 Attempts: {attempts:,} | ⏱ Speed: {speed:.1f}/sec".center(width),
-            "",
-            f"🎯 Offset 0x{i:06X} | Rolls: {dice_display}".center(width),
-            ""
-        ]
-
-        if compute_delta(older_rom, newer_rom):
-            evolve_rom()
-            new_locked = get_locked_in_count()
-            if new_locked > locked:
-                lines.append(f"🎯 DISCOVERED! Total: {new_locked}/{TOTAL_HEX_CHARS} ✅".center(width))
-            else:
-                lines.append(f"🔒 Discovered: {locked}/{TOTAL_HEX_CHARS}".center(width))
-            try:
-                update_byte_tracker()
-            except:
-                pass
-
-        print_frame(["\n"] + lines + ["\n"])
-        time.sleep(0.25)
+            batch_start = time.perf_counter()
+            index, good, rolls, hits = roll_nibbles(batch_size, window)
+            if len(index) == 0:
+                if get_frontier().next_unlocked() is None:
+                    renderer.update({"message": "✅ Evolution complete. All offsets discovered!"})
+                    break
+                pacer.idle()
+                continue
+            batch_time = time.perf_counter() - batch_start
+            attempts += len(index)
+            locked = count_batch(metrics, index, hits, batch_time, attempts, locked)
+            with metrics.time("checkpoint"):
+                checkpoint(attempts)
+
+            elapsed_time = time.time() - start_time
+            speed = (attempts - resumed) / elapsed_time if elapsed_time > 0 else 0
+            state = batch_state(spinner_idx, older_rom, newer_rom, attempts, speed,
+                                index, rolls, hits, batch_time, locked, pacer, metrics)
+
+            # In --subprocess mode these stages include the python3 spawn.
+            with metrics.time("delta"):
+                delta_ok = pipeline.compute_delta(older_rom, newer_rom) if pipeline else compute_delta(older_rom, newer_rom)
+            # The subprocess re-reads both files; the pipeline only reads cache misses.
+            metrics.inc("bytes_read", pipeline.bytes_read if pipeline else rom_file_bytes(older_rom, newer_rom))
+            state["delta_ok"] = delta_ok
+            if delta_ok:
+                with metrics.time("evolve"):
+                    if pipeline:
+                        pipeline.evolve()
+                        written = pipeline.bytes_written
+                    else:
+                        written = rom_file_bytes(evolve_rom())
+                metrics.inc("roms_written")
+                metrics.inc("bytes_written", written)
+                counters = get_counters()
+                state["new_locked"] = get_locked_in_count()
+                state["lines_closed"] = counters.lines_closed
+                state["cubes_closed"] = counters.cubes_closed
+                try:
+                    with metrics.time("tracker_update"):
+                        if pipeline:
+                            pipeline.update_tracker()
+                        else:
+                            update_byte_tracker()
+                        counters.flush()
+                except:
+                    pass
+
+            renderer.update(state)
+            metrics.maybe_export()
+            pacer.tick()
+    finally:
+        renderer.close()
+        checkpoint(attempts, force=True)
+        metrics.export()
+
+async def run_loop_pipelined(batch_size=1, window=None, headless=False, pacer=None, metrics=None, io_depth=4):
+    # Same steps, in the same order, as run_loop with the in-process
+    # pipeline: every tracker, frontier and RNG operation stays on this
+    # thread, so the tracker ends up exactly as sequential mode leaves it.
+    # Only the writes (roll log, try script, ROM store, tracker/counter
+    # flushes) go through an IoQueue and overlap the next iteration.
+    ensure_try_script_exists()
+    pacer = pacer or Pacer()
+    metrics = metrics or LoopMetrics(STATS_BASE)
+    pipeline = make_pipeline()
+    io = IoQueue(io_depth, metrics)
+    renderer = make_renderer(headless, metrics)
+    spinner_idx = 0
+    locked = get_locked_in_count()
+    resumed = attempts = get_checkpoints().attempts
+    start_time = time.time()
+
+    try:
+        while True:
+            spinner_idx += 1
+
+            older_rom, newer_rom = get_latest_roms(pipeline.history)
+            if older_rom is None or newer_rom is None:
+                renderer.update({"message": "⏳ Waiting for at least two ROMs to compare..."})
+                await asyncio.sleep(pacer.idle_delay_next())
+                continue
+
+            writes = []
+            batch_start = time.perf_counter()
+            index, good, rolls, hits = roll_nibbles(batch_size, window, writes)
+            if len(index) == 0:
+                if get_frontier().next_unlocked() is None:
+                    renderer.update({"message": "✅ Evolution complete. All offsets discovered!"})
+                    break
+                await asyncio.sleep(pacer.idle_delay_next())
+                continue
+            batch_time = time.perf_counter() - batch_start
+            for stage, fn, args in writes:
+                await io.submit(stage, fn, *args)
+            attempts += len(index)
+            locked = count_batch(metrics, index, hits, batch_time, attempts, locked)
+            if get_checkpoints().due():
+                # A base must see every write before it; wait for the queue.
+                await io.drain()
+                with metrics.time("checkpoint"):
+                    checkpoint(attempts)
+
+            elapsed_time = time.time() - start_time
+            speed = (attempts - resumed) / elapsed_time if elapsed_time > 0 else 0
+            state = batch_state(spinner_idx, older_rom, newer_rom, attempts, speed,
+                                index, rolls, hits, batch_time, locked, pacer, metrics)
+
+            with metrics.time("delta"):
+                delta_ok = pipeline.compute_delta(older_rom, newer_rom)
+            metrics.inc("bytes_read", pipeline.bytes_read)
+            state["delta_ok"] = delta_ok
+            if delta_ok:
+                with metrics.time("evolve"):
+                    _, persist = pipeline.stage_evolve()
+                await io.submit("rom_write", persist)
+                metrics.inc("roms_written")
+                metrics.inc("bytes_written", pipeline.bytes_written)
+                counters = get_counters()
+                state["new_locked"] = get_locked_in_count()
+                state["lines_closed"] = counters.lines_closed
+                state["cubes_closed"] = counters.cubes_closed
+                with metrics.time("tracker_update"):
+                    pipeline.update_tracker(flush=False)
+                await io.submit("tracker_flush", flush_tracker)
+
+            renderer.update(state)
+            metrics.maybe_export()
+            await asyncio.sleep(pacer.tick_delay())
+    finally:
+        try:
+            await io.close()
+        finally:
+            renderer.close()
+            checkpoint(attempts, force=True)
+            metrics.export()
 
 if __name__ == "__main__":
-    clear_screen()
-    run_loop()
+    parser = argparse.ArgumentParser(description="Byte evolution tracker")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="run delta/evolve as python3 subprocesses instead of in-process")
+    parser.add_argument("--batch", type=int, default=None, metavar="K",
+                        help="roll the next K unlocked nibbles per iteration (default: 1)")
+    parser.add_argument("--window", type=int, default=None, metavar="N",
+                        help="roll every unlocked nibble within N positions of the frontier")
+    parser.add_argument("--headless", action="store_true",
+                        help="no screen UI, print a one-line stats summary every few seconds")
+    parser.add_argument("--stats-every", type=float, default=10.0, metavar="SECONDS",
+                        help="write loop_stats.json/.prom this often, 0 for only on exit (default: 10)")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="overlap each iteration's disk writes with the next one's compute (asyncio)")
+    parser.add_argument("--io-depth", type=int, default=4, metavar="N",
+                        help="writes --pipelined may queue before the loop waits for the disk (default: 4)")
+    add_pacing_args(parser)
+    args = parser.parse_args()
+    if args.window is not None and args.window < 1:
+        parser.error("--window must be at least 1")
+    batch_size = args.batch or args.window or 1
+    metrics = LoopMetrics(STATS_BASE, every=args.stats_every)
+    if args.pipelined and not args.subprocess and EvolutionPipeline is not None:
+        asyncio.run(run_loop_pipelined(batch_size=batch_size, window=args.window, headless=args.headless,
+                                       pacer=pacer_from_args(args), metrics=metrics, io_depth=args.io_depth))
+    else:
+        run_loop(use_subprocess=args.subprocess, batch_size=batch_size, window=args.window,
+                 headless=args.headless, pacer=pacer_from_args(args), metrics=metrics)
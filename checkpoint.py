@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import struct
+
+import numpy as np
+
+from nibble_tracker import LOCK_VALUE
+
+# === CHECKPOINTS: BASE + LOCK JOURNAL ===
+# Crash-safe progress for the nibble tracker, in two files:
+#
+#   <base>.ckpt      "CKPT" | version u16 | reserved u16 | epoch u64
+#                    | nibble count u64 | attempts u64 | unix time f64
+#                    | counters packed two per byte (high nibble first)
+#   <base>.journal   "CKJN" | version u16 | reserved u16 | epoch u64
+#                    | (nibble index u64, attempts u64) per lock event
+#
+# Lock events are appended to the journal as they happen (it listens on the
+# tracker). Every so often a new base is written to a temp file, fsynced
+# and renamed over the old one, then a fresh journal for the next epoch
+# replaces the old journal the same way. A journal whose epoch doesn't
+# match the base is left over from before that base and is ignored, so
+# recovery always sees a consistent pair.
+#
+# Recovery max-merges the base into the tracker and re-locks every journal
+# entry: counters only grow, so replaying onto a newer tracker is harmless.
+
+MAGIC = b"CKPT"
+JOURNAL_MAGIC = b"CKJN"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQQd")
+JOURNAL_HEADER = struct.Struct("<4sHHQ")
+JOURNAL_RECORD = np.dtype([("index", "<u8"), ("attempts", "<u8")])
+BASE_EVERY_EVENTS = 1 << 16
+BASE_EVERY_SECONDS = 300.0
+
+def pack_counts(counts):
+    counts = np.asarray(counts, dtype=np.uint8)
+    if len(counts) % 2:
+        counts = np.append(counts, np.uint8(0))
+    return (counts[0::2] << 4) | (counts[1::2] & 0x0F)
+
+def unpack_counts(packed, size):
+    counts = np.empty(len(packed) * 2, dtype=np.uint8)
+    counts[0::2] = packed >> 4
+    counts[1::2] = packed & 0x0F
+    return counts[:size]
+
+def write_atomic(path, chunks):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class Checkpoints:
+    def __init__(self, base_path, size):
+        self.base_file = f"{base_path}.ckpt"
+        self.journal_path = f"{base_path}.journal"
+        self.size = size
+        self.epoch = 0
+        self.attempts = 0
+        self.journal = None
+        self.events = 0
+        self.last_base = time.monotonic()
+
+    @classmethod
+    def open(cls, base_path, tracker):
+        checkpoints = cls(base_path, tracker.size)
+        checkpoints.recover(tracker)
+        tracker.listeners.append(checkpoints.log_locks)
+        return checkpoints
+
+    # === Reading ===
+    def read_base(self):
+        # (epoch, attempts, counts), or None without a usable base.
+        if not os.path.exists(self.base_file):
+            return None
+        with open(self.base_file, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return None
+            magic, version, _, epoch, count, attempts, _ = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION or count != self.size:
+                return None
+            packed = np.fromfile(f, dtype=np.uint8, count=(count + 1) // 2)
+        if len(packed) != (count + 1) // 2:
+            return None
+        return epoch, attempts, unpack_counts(packed, count)
+
+    def read_journal(self, epoch):
+        # Whole records of the journal for `epoch`; a torn last record is dropped.
+        if not os.path.exists(self.journal_path):
+            return np.empty(0, dtype=JOURNAL_RECORD)
+        with open(self.journal_path, "rb") as f:
+            header = f.read(JOURNAL_HEADER.size)
+            if len(header) < JOURNAL_HEADER.size:
+                return np.empty(0, dtype=JOURNAL_RECORD)
+            magic, version, _, journal_epoch = JOURNAL_HEADER.unpack(header)
+            if magic != JOURNAL_MAGIC or version != VERSION or journal_epoch != epoch:
+                return np.empty(0, dtype=JOURNAL_RECORD)
+            raw = f.read()
+        whole = len(raw) // JOURNAL_RECORD.itemsize * JOURNAL_RECORD.itemsize
+        return np.frombuffer(raw[:whole], dtype=JOURNAL_RECORD)
+
+    def recover(self, tracker):
+        base = self.read_base()
+        epoch, attempts = 0, 0
+        if base is not None:
+            epoch, attempts, counts = base
+            tracker.merge(0, counts)
+
+        records = self.read_journal(epoch)
+        index = records["index"].astype(np.int64)
+        index = index[index < tracker.size]
+        if len(index):
+            tracker.lock(index)
+        if len(records):
+            attempts = max(attempts, int(records["attempts"].max()))
+        tracker.flush()
+
+        self.epoch = epoch
+        self.attempts = attempts
+        self.events = len(records)
+        self.open_journal(len(records))
+
+    # === Writing ===
+    def open_journal(self, keep_records):
+        if self.journal is not None:
+            self.journal.close()
+        if keep_records == 0 and not self.journal_matches():
+            write_atomic(self.journal_path, [JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, 0, self.epoch)])
+        # Unbuffered like the roll log: one write(2) per batch of lock events.
+        self.journal = open(self.journal_path, "ab", buffering=0)
+        self.journal.truncate(JOURNAL_HEADER.size + keep_records * JOURNAL_RECORD.itemsize)
+
+    def journal_matches(self):
+        try:
+            with open(self.journal_path, "rb") as f:
+                header = f.read(JOURNAL_HEADER.size)
+        except OSError:
+            return False
+        return (len(header) == JOURNAL_HEADER.size
+                and JOURNAL_HEADER.unpack(header) == (JOURNAL_MAGIC, VERSION, 0, self.epoch))
+
+    def log_locks(self, newly):
+        # Tracker listener: one journal record per newly locked nibble.
+        if self.journal is None or len(newly) == 0:
+            return
+        records = np.empty(len(newly), dtype=JOURNAL_RECORD)
+        records["index"] = newly
+        records["attempts"] = self.attempts
+        self.journal.write(records.tobytes())
+        self.events += len(newly)
+
+    def write_base(self, tracker):
+        tracker.flush()
+        epoch = self.epoch + 1
+        header = HEADER.pack(MAGIC, VERSION, 0, epoch, tracker.size, self.attempts, time.time())
+        write_atomic(self.base_file, [header, pack_counts(tracker.counts).tobytes()])
+        # The new base already holds every journalled lock; start its journal.
+        self.epoch = epoch
+        write_atomic(self.journal_path, [JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, 0, epoch)])
+        self.open_journal(0)
+        self.events = 0
+        self.last_base = time.monotonic()
+
+    def due(self):
+        return (self.events >= BASE_EVERY_EVENTS
+                or (self.events and time.monotonic() - self.last_base >= BASE_EVERY_SECONDS))
+
+    def maybe_write_base(self, tracker):
+        if self.due():
+            self.write_base(tracker)
+            return True
+        return False
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: checkpoint.py <checkpoint base path>")
+        sys.exit(1)
+
+    checkpoints = Checkpoints(sys.argv[1], 0)
+    with open(checkpoints.base_file, "rb") as f:
+        magic, version, _, epoch, count, attempts, stamp = HEADER.unpack(f.read(HEADER.size))
+    checkpoints.size = count
+    base = checkpoints.read_base()
+    journal = checkpoints.read_journal(epoch)
+    locked = int(np.count_nonzero(base[2] >= LOCK_VALUE)) if base is not None else 0
+    print(f"📦 Base epoch {epoch}: {count:,} nibbles, {locked:,} locked, {attempts:,} attempts "
+          f"at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stamp))}")
+    print(f"📝 Journal: {len(journal):,} lock events since")
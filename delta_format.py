@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import os
+import sys
+import struct
+import shutil
+import hashlib
+
+import numpy as np
+
+# === BINARY SPARSE DELTA FORMAT ===
+# One file per ROM comparison, columnar so readers can map it straight in:
+#
+#   magic "DLTA" | version u16 | offset width u8 (4 or 8) | reserved u8
+#   | count u64 | delta sum u64 | rom1 size u64 | rom2 size u64
+#   | rom1 hash (16 bytes) | rom2 hash (16 bytes)
+#   | offsets u32/u64[count] | old u8[count] | new u8[count]
+#
+# Hashes are blake2b-128 of the full images. The text log
+# ("0x%04X: AA -> BB (Δ n)" per byte) is only an export for humans now.
+#
+# Offsets only cover the bytes both images share. When the sizes differ the
+# rest is a trailing region (insert if rom2 is longer, delete if shorter),
+# described by the two sizes in the header rather than by per-byte records.
+
+MAGIC = b"DLTA"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBQQQQ16s16s")
+HEX_BYTES = [f"{i:02X}" for i in range(256)]
+
+def offset_width(size):
+    return 4 if size <= 0xFFFFFFFF else 8
+
+def trailing_region(size1, size2):
+    # ("insert" | "delete", start offset, length), or None for equal sizes.
+    if size2 > size1:
+        return "insert", size1, size2 - size1
+    if size1 > size2:
+        return "delete", size2, size1 - size2
+    return None
+
+def rom_hash(data):
+    return hashlib.blake2b(np.ascontiguousarray(data).tobytes(), digest_size=16).digest()
+
+class DeltaLog:
+    def __init__(self, delta_sum, offsets, old, new, size1=0, size2=0, hash1=bytes(16), hash2=bytes(16)):
+        self.delta_sum = delta_sum
+        self.offsets = offsets
+        self.old = old
+        self.new = new
+        self.size1 = size1
+        self.size2 = size2
+        self.hash1 = hash1
+        self.hash2 = hash2
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def diffs(self):
+        return np.abs(self.old.astype(np.int16) - self.new.astype(np.int16))
+
+    @property
+    def trailing(self):
+        return trailing_region(self.size1, self.size2)
+
+    def changed_nibbles(self):
+        return changed_nibbles(self.offsets, self.old, self.new)
+
+def changed_nibbles(offsets, old, new):
+    # Nibble index is 2 * byte offset for the high nibble, +1 for the low.
+    offsets = offsets.astype(np.int64)
+    hi_old, hi_new = old >> 4, new >> 4
+    lo_old, lo_new = old & 0x0F, new & 0x0F
+    hi = hi_old != hi_new
+    lo = lo_old != lo_new
+    index = np.concatenate([offsets[hi] * 2, offsets[lo] * 2 + 1])
+    value = np.concatenate([hi_new[hi], lo_new[lo]])
+    return index, value
+
+def is_delta_file(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+# === Writing ===
+def write_delta(path, delta):
+    last = int(delta.offsets[-1]) if len(delta) else 0
+    width = offset_width(max(last, delta.size1, delta.size2))
+    header = HEADER.pack(MAGIC, VERSION, width, 0, len(delta), delta.delta_sum,
+                         delta.size1, delta.size2, delta.hash1, delta.hash2)
+    # Write beside the target and rename, so a reader never maps a half file.
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(np.asarray(delta.offsets, dtype=f"<u{width}").tobytes())
+        f.write(np.asarray(delta.old, dtype=np.uint8).tobytes())
+        f.write(np.asarray(delta.new, dtype=np.uint8).tobytes())
+    os.replace(tmp_path, path)
+
+class DeltaWriter:
+    # Streams chunks into the same layout as write_delta. Offsets go straight
+    # into the output; old/new go to side files and are appended on close,
+    # when the final count, sum and hashes are written into the header.
+    def __init__(self, path, size1, size2):
+        self.path = path
+        self.size1 = size1
+        self.size2 = size2
+        self.width = offset_width(max(size1, size2))
+        self.count = 0
+        self.delta_sum = 0
+        self.tmp_path = f"{path}.tmp"
+        self.f = open(self.tmp_path, "wb")
+        self.f.write(bytes(HEADER.size))
+        self.old_f = open(f"{path}.old.tmp", "w+b")
+        self.new_f = open(f"{path}.new.tmp", "w+b")
+
+    def write(self, delta_sum, offsets, old, new):
+        self.f.write(np.asarray(offsets, dtype=f"<u{self.width}").tobytes())
+        self.old_f.write(np.asarray(old, dtype=np.uint8).tobytes())
+        self.new_f.write(np.asarray(new, dtype=np.uint8).tobytes())
+        self.count += len(offsets)
+        self.delta_sum += int(delta_sum)
+
+    def close(self, hash1=bytes(16), hash2=bytes(16)):
+        for side in (self.old_f, self.new_f):
+            side.seek(0)
+            shutil.copyfileobj(side, self.f)
+            side.close()
+            os.remove(side.name)
+        self.f.seek(0)
+        self.f.write(HEADER.pack(MAGIC, VERSION, self.width, 0, self.count, self.delta_sum,
+                                 self.size1, self.size2, hash1, hash2))
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+# === Reading ===
+def read_delta(path):
+    with open(path, "rb") as f:
+        magic, version, width, _, count, delta_sum, size1, size2, hash1, hash2 = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a binary delta log")
+    if count == 0:
+        empty = np.empty(0, dtype=np.uint8)
+        return DeltaLog(delta_sum, np.empty(0, dtype=f"<u{width}"), empty, empty, size1, size2, hash1, hash2)
+
+    # Zero-copy: the three columns are views on one read-only mapping.
+    raw = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size, shape=(count * (width + 2),))
+    offsets = raw[:count * width].view(f"<u{width}")
+    old = raw[count * width:count * (width + 1)]
+    new = raw[count * (width + 1):]
+    return DeltaLog(delta_sum, offsets, old, new, size1, size2, hash1, hash2)
+
+# === Text export ===
+def write_text(path, delta_sum, offsets, old, new):
+    diffs = np.abs(old.astype(np.int16) - new.astype(np.int16))
+    lines = [
+        f"0x{index:04X}: {HEX_BYTES[a]} -> {HEX_BYTES[b]} (Δ {d})\n"
+        for index, a, b, d in zip(offsets.tolist(), old.tolist(), new.tolist(), diffs.tolist())
+    ]
+    with open(path, "w") as f:
+        f.write(f"Delta Sum: {delta_sum}\n")
+        f.write("".join(lines))
+
+def export_text(delta, path):
+    write_text(path, delta.delta_sum, delta.offsets, delta.old, delta.new)
+    if delta.trailing is not None:
+        kind, start, length = delta.trailing
+        with open(path, "a") as f:
+            f.write(f"Trailing {kind}: 0x{start:04X} +{length} bytes\n")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: delta_format.py <delta.bin> <delta_log.txt>")
+        sys.exit(1)
+
+    delta = read_delta(sys.argv[1])
+    export_text(delta, sys.argv[2])
+    print(f"✅ Exported {len(delta)} deltas (sum {delta.delta_sum}) to {os.path.abspath(sys.argv[2])}")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+
+import numpy as np
+
+from delta_format import is_delta_file, read_delta
+
+# === DELTA LOG PARSER ===
+# Every delta log dialect the scripts have written, read in one pass with
+# one regex per line:
+#
+#   DLTA binary                          delta_format.py (mapped, not parsed)
+#   Delta Sum: 1234                      text export header
+#   0x0010: AA -> BB (Δ 17)              text export, one line per byte
+#   Line 12:                             legacy report: starts a line group
+#   idx 03: (12) ... (15) → Δ Notch = 3  legacy report entry in that group;
+#                                        the (a) (b) values and the notch are
+#                                        optional, as not every writer had them
+#   (12,3): 3                            legacy coordinate log
+#
+# Byte records land in offset arrays, legacy records in (line, idx) arrays.
+# Results are memoized on (path, size, mtime), so a log passed as both log1
+# and log2 -- or parsed again next iteration unchanged -- is read once.
+# Treat a returned ParsedLog as read-only: it is shared between callers.
+
+RECORD = re.compile(
+    r"\s*(?:"
+    r"0x(?P<offset>[0-9A-Fa-f]+):\s*(?P<old>[0-9A-Fa-f]{1,2})\s*->\s*(?P<new>[0-9A-Fa-f]{1,2})"
+    r"|Delta Sum:\s*(?P<delta_sum>\d+)"
+    r"|\((?P<coord_line>\d+),\s*(?P<coord_idx>\d+)\):\s*(?P<coord_delta>\d+)"
+    r"|(?:Line (?P<line>\d+):)?.*?idx (?P<idx>\d+):"
+    r"(?:.*?\((?P<left>\d+)\).*?\((?P<right>\d+)\))?(?:.*?→ Δ Notch = (?P<notch>\d+))?"
+    r"|Line (?P<line_only>\d+):"
+    r")"
+)
+MISSING = -1  # legacy fields a line didn't carry
+
+class ParsedLog:
+    def __init__(self, delta_sum=None, offsets=None, old=None, new=None,
+                 lines=None, idx=None, notches=None, left=None, right=None, texts=None):
+        empty = np.empty(0, dtype=np.int64)
+        self.delta_sum = delta_sum
+        # Byte records.
+        self.offsets = offsets if offsets is not None else empty
+        self.old = old if old is not None else np.empty(0, dtype=np.uint8)
+        self.new = new if new is not None else np.empty(0, dtype=np.uint8)
+        # Legacy (line, idx) records; missing fields are MISSING.
+        self.lines = lines if lines is not None else empty
+        self.idx = idx if idx is not None else empty
+        self.notches = notches if notches is not None else empty
+        self.left = left if left is not None else empty
+        self.right = right if right is not None else empty
+        # Stripped source text of each (line, idx) record, for scripts that copy it through.
+        self.texts = texts if texts is not None else []
+
+    @property
+    def diffs(self):
+        return np.abs(self.old.astype(np.int16) - self.new.astype(np.int16))
+
+    def __len__(self):
+        return len(self.offsets) + len(self.lines)
+
+    def offset_map(self):
+        # {offset: |old - new|}
+        return dict(zip(self.offsets.tolist(), self.diffs.tolist()))
+
+    def coord_map(self):
+        # {(line, idx): notch} for records that carried one.
+        keep = self.notches != MISSING
+        return dict(zip(zip(self.lines[keep].tolist(), self.idx[keep].tolist()),
+                        self.notches[keep].tolist()))
+
+    def text_map(self):
+        # {(line, idx): source text}
+        return dict(zip(zip(self.lines.tolist(), self.idx.tolist()), self.texts))
+
+def parse_text(path):
+    delta_sum = None
+    offsets, old, new = [], [], []
+    lines, idx, notches, left, right, texts = [], [], [], [], [], []
+    current_line = 0
+    with open(path, "r", errors="replace") as f:
+        for text in f:
+            m = RECORD.match(text)
+            if m is None:
+                continue
+            offset = m.group("offset")
+            if offset is not None:
+                offsets.append(int(offset, 16))
+                old.append(int(m.group("old"), 16))
+                new.append(int(m.group("new"), 16))
+                continue
+            if m.group("delta_sum") is not None:
+                delta_sum = int(m.group("delta_sum"))
+                continue
+            if m.group("coord_line") is not None:
+                lines.append(int(m.group("coord_line")))
+                idx.append(int(m.group("coord_idx")))
+                notches.append(int(m.group("coord_delta")))
+                left.append(MISSING)
+                right.append(MISSING)
+                texts.append(text.strip())
+                continue
+            group_line = m.group("line") or m.group("line_only")
+            if group_line is not None:
+                current_line = int(group_line)
+            if m.group("idx") is not None:
+                lines.append(current_line)
+                idx.append(int(m.group("idx")))
+                notch, a, b = m.group("notch", "left", "right")
+                notches.append(int(notch) if notch is not None else MISSING)
+                left.append(int(a) if a is not None else MISSING)
+                right.append(int(b) if b is not None else MISSING)
+                texts.append(text.strip())
+
+    as_int = lambda values: np.array(values, dtype=np.int64)
+    return ParsedLog(delta_sum, as_int(offsets), np.array(old, dtype=np.uint8), np.array(new, dtype=np.uint8),
+                     as_int(lines), as_int(idx), as_int(notches), as_int(left), as_int(right), texts)
+
+def parse_binary(path):
+    delta = read_delta(path)
+    return ParsedLog(delta.delta_sum, delta.offsets, delta.old, delta.new)
+
+CACHE = {}
+
+def parse_delta_log(path):
+    # Memoized on (path, size, mtime); a missing file parses as empty.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ParsedLog()
+    key = os.path.abspath(path)
+    stamp = (st.st_size, st.st_mtime_ns)
+    cached = CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    parsed = parse_binary(path) if is_delta_file(path) else parse_text(path)
+    CACHE[key] = (stamp, parsed)
+    return parsed
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: delta_parser.py <delta log> [...]")
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        parsed = parse_delta_log(path)
+        print(f"📄 {path}: {len(parsed.offsets)} byte records, {len(parsed.lines)} line/idx records, "
+              f"delta sum {parsed.delta_sum}")
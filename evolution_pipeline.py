@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import os
+
+import numpy as np
+
+from rom_delta_logger import load_rom, compute_delta_arrays
+from delta_format import DeltaLog, rom_hash, write_delta, changed_nibbles
+from rom_index import new_rom_name
+from try_patch import format_colon_script
+
+# === IN-PROCESS EVOLUTION PIPELINE ===
+# delta → evolve → tracker update, run inside the caller's interpreter.
+# ROM images, the known-good ROM and the last delta stay in memory between
+# iterations instead of being re-read by a fresh python3 per step.
+
+ROM_SIZE = 512 * 1024
+
+class EvolutionPipeline:
+    def __init__(self, rom_dir, oracle, tracker, delta_log, try_script,
+                 write_log=False, history=None, rom_index=None):
+        self.rom_dir = rom_dir
+        self.oracle = oracle
+        self.tracker = tracker
+        self.delta_log = delta_log
+        self.try_script = try_script
+        self.write_log = write_log
+        # With a RomHistory, ROMs are generation numbers instead of file paths.
+        self.history = history
+        # Without one, evolved_rom_*.bin files are also recorded in a RomIndex.
+        self.rom_index = rom_index
+
+        self.roms = {}
+        self.delta_sum = 0
+        self.offsets = None
+        self.old = None
+        self.new = None
+        self.latest_rom = None
+        # Bytes the last compute_delta loaded from disk (cache hits are
+        # free) and the size of the last ROM stage_evolve produced.
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    # === ROM cache ===
+    def get_rom(self, path):
+        if self.history is not None and isinstance(path, int):
+            cached = path in self.history.cache
+            rom = self.history.materialize(path)
+        else:
+            rom = self.roms.get(path)
+            cached = rom is not None
+            if not cached:
+                rom = load_rom(path)
+                self.remember_rom(path, rom)
+        if not cached:
+            self.bytes_read += len(rom)
+        return rom
+
+    def remember_rom(self, path, rom):
+        # Only the two most recent images are ever compared, keep three so
+        # the pair plus a freshly evolved ROM never forces a re-read.
+        self.roms[path] = rom
+        while len(self.roms) > 3:
+            del self.roms[next(iter(self.roms))]
+
+    # === Pipeline stages ===
+    def compute_delta(self, rom1, rom2):
+        self.bytes_read = 0
+        b1 = self.get_rom(rom1)
+        b2 = self.get_rom(rom2)
+        if len(b1) != len(b2):
+            return False
+        self.delta_sum, self.offsets, self.old, self.new = compute_delta_arrays(b1, b2)
+        if self.write_log:
+            write_delta(self.delta_log, DeltaLog(self.delta_sum, self.offsets, self.old, self.new,
+                                                 len(b1), len(b2), rom_hash(b1), rom_hash(b2)))
+        return True
+
+    def write_try_script(self, offsets=None, old=None, new=None):
+        # Same selection evolve_try_script_from_deltas_compared.py makes when
+        # both logs are the latest delta: the smaller delta is the delta itself.
+        if offsets is None:
+            offsets, old, new = self.offsets, self.old, self.new
+        diffs = np.abs(old.astype(np.int16) - new.astype(np.int16))
+        with open(self.try_script, "wb") as f:
+            f.write(format_colon_script(offsets, diffs))
+
+    def evolve(self):
+        rom, persist = self.stage_evolve()
+        persist()
+        return rom
+
+    def stage_evolve(self):
+        # The new ROM is usable by the next compute_delta as soon as this
+        # returns; the try script and ROM writes are left in `persist`.
+        delta = (self.offsets, self.old, self.new) if self.offsets is not None else None
+        rom = np.frombuffer(os.urandom(ROM_SIZE), dtype=np.uint8)
+        self.bytes_written = len(rom)
+        if self.history is not None:
+            self.latest_rom, store = self.history.stage(rom)
+        else:
+            path = os.path.join(self.rom_dir, new_rom_name())
+            self.remember_rom(path, rom)
+            self.latest_rom = path
+
+            def store():
+                with open(path, "wb") as f:
+                    f.write(rom.tobytes())
+                if self.rom_index is not None:
+                    self.rom_index.add(path)
+
+        def persist():
+            if delta is not None:
+                self.write_try_script(*delta)
+            store()
+
+        return self.latest_rom, persist
+
+    def changed_nibbles(self):
+        return changed_nibbles(self.offsets, self.old, self.new)
+
+    def update_tracker(self, flush=True):
+        if self.oracle is None or self.offsets is None:
+            return 0
+
+        index, value = self.changed_nibbles()
+        newly = self.tracker.score(index, value, self.oracle)
+        if flush:
+            self.tracker.flush()
+        return len(newly)
@@ -1,52 +1,72 @@
 import sys
-import random
 import json
 import os
 
-WEIGHTS_FILE = "delta_weights.json"
+import numpy as np
 
-def evolve_try_script(log1, log2, output_file):
-    weights = load_weights()
-    diffs1 = parse_log(log1)
-    diffs2 = parse_log(log2)
-    if not diffs1 or not diffs2:
+from delta_parser import parse_delta_log
+from delta_format import HEX_BYTES
+
+WEIGHTS_FILE = "delta_weights.npy"
+LEGACY_WEIGHTS_FILE = "delta_weights.json"
+DEFAULT_WEIGHT = 1.0
+
+def evolve_try_script(log1, log2, output_file, rng=None):
+    rng = rng or np.random.default_rng()
+    delta1 = parse_delta_log(log1)
+    delta2 = parse_delta_log(log2)
+    if len(delta1.offsets) == 0 or len(delta2.offsets) == 0:
         print("⚠️ Could not load delta logs.")
         return
 
-    final = {}
-    for k in set(diffs1.keys()).union(diffs2.keys()):
-        v1 = diffs1.get(k, 0)
-        v2 = diffs2.get(k, 0)
-        trending = v1 - v2
-        weights[k] = weights.get(k, 1.0) + trending / 100.0
-        final[k] = int(random.choices(range(256), weights=[weights[k]]*256)[0])
+    # Every offset in either log; one missing from a log counts as 0 there.
+    offsets1 = delta1.offsets.astype(np.int64)
+    offsets2 = delta2.offsets.astype(np.int64)
+    keys = np.union1d(offsets1, offsets2)
+    v1 = np.zeros(len(keys), dtype=np.float32)
+    v2 = np.zeros(len(keys), dtype=np.float32)
+    v1[np.searchsorted(keys, offsets1)] = delta1.diffs
+    v2[np.searchsorted(keys, offsets2)] = delta2.diffs
+
+    weights = grow(load_weights(), int(keys[-1]) + 1)
+    weights[keys] += (v1 - v2) / 100.0
+    # The weight scales all 256 values alike, so the draw itself is uniform.
+    final = rng.integers(0, 256, size=len(keys))
 
     with open(output_file, "w") as out:
-        for k, val in final.items():
-            out.write(f"{k} {val:02X}\n")
-    with open(WEIGHTS_FILE, "w") as w:
-        json.dump(weights, w)
+        out.write("".join(f"{k} {HEX_BYTES[val]}\n" for k, val in zip(keys.tolist(), final.tolist())))
+    save_weights(weights)
     print(f"✅ Selection file written: {output_file}")
     print("📈 Weights updated.")
 
+# === Weight state ===
+# Dense float32, indexed by byte offset; offsets never seen hold DEFAULT_WEIGHT.
+def grow(weights, size):
+    if len(weights) >= size:
+        return weights
+    grown = np.full(size, DEFAULT_WEIGHT, dtype=np.float32)
+    grown[:len(weights)] = weights
+    return grown
+
 def load_weights():
     if os.path.exists(WEIGHTS_FILE):
-        with open(WEIGHTS_FILE) as f:
-            return json.load(f)
-    return {}
+        return np.load(WEIGHTS_FILE).astype(np.float32, copy=False)
+    if os.path.exists(LEGACY_WEIGHTS_FILE):
+        # One-time import of the old {offset: weight} JSON map.
+        with open(LEGACY_WEIGHTS_FILE) as f:
+            legacy = {int(k): v for k, v in json.load(f).items()}
+        if legacy:
+            weights = grow(np.empty(0, dtype=np.float32), max(legacy) + 1)
+            weights[list(legacy)] = list(legacy.values())
+            return weights
+    return np.empty(0, dtype=np.float32)
+
+def save_weights(weights):
+    tmp_path = f"{WEIGHTS_FILE}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, weights)
+    os.replace(tmp_path, WEIGHTS_FILE)
 
 def parse_log(path):
-    if not os.path.exists(path):
-        return {}
-    out = {}
-    with open(path) as f:
-        for line in f:
-            if "->" in line:
-                parts = line.split()
-                try:
-                    idx = int(parts[0])
-                    delta = abs(int(parts[2], 16) - int(parts[0], 16))
-                    out[idx] = delta
-                except:
-                    continue
-    return out
+    # {offset: |old - new|} from a binary or text delta log.
+    return parse_delta_log(path).offset_map()
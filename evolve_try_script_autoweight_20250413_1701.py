@@ -4,6 +4,8 @@ import os
 import json
 from datetime import datetime
 
+from delta_parser import parse_delta_log
+
 # === CONFIG ===
 log1_path = "rom_delta_log_1_20250413_090649.txt"
 log2_path = "rom_delta_log_2_20250413_090649.txt"
@@ -11,18 +13,8 @@ output_script = "evolved_try_script.txt"
 weights_file = "delta_weights.json"
 
 # === Load logs ===
-def parse_delta_log(path):
-    delta_map = {}
-    with open(path, 'r') as f:
-        for line in f:
-            if line.startswith("(") and "):" in line:
-                coord, delta = line.strip().split(":")
-                coord = tuple(map(int, coord.strip("()").split(",")))
-                delta_map[coord] = int(delta.strip())
-    return delta_map
-
-delta1 = parse_delta_log(log1_path)
-delta2 = parse_delta_log(log2_path)
+delta1 = parse_delta_log(log1_path).coord_map()
+delta2 = parse_delta_log(log2_path).coord_map()
 
 # === Load or init weights ===
 if os.path.exists(weights_file):
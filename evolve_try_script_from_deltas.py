@@ -1,23 +1,13 @@
 #!/usr/bin/env python3
-import re
+from delta_parser import parse_delta_log
 
 delta_file_1 = "rom_delta_log_1_20250413_090649.txt"
 delta_file_2 = "rom_delta_log_2_20250413_090649.txt"
 output_file = "evolved_try_script.txt"
 
 def parse_deltas(filename):
-    deltas = {}  # {(line_number, idx_number): delta_value}
-    with open(filename) as f:
-        line_num = 0
-        for line in f:
-            if line.startswith("Line "):
-                line_num = int(re.search(r"Line (\d+):", line).group(1))
-            matches = re.findall(r"idx (\d+):.*→ Δ Notch = (\d+)", line)
-            for idx_str, delta_str in matches:
-                idx = int(idx_str)
-                delta = int(delta_str)
-                deltas[(line_num, idx)] = delta
-    return deltas
+    # {(line_number, idx_number): delta_value}
+    return parse_delta_log(filename).coord_map()
 
 delta1 = parse_deltas(delta_file_1)
 delta2 = parse_deltas(delta_file_2)
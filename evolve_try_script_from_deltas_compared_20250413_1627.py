@@ -5,7 +5,8 @@
 # 📅 Creation timestamp: 20250413_1627
 
 import sys
-import re
+
+from delta_parser import parse_delta_log
 
 # File paths
 log1_path = "rom_delta_log_1_20250413_090649.txt"
@@ -13,36 +14,13 @@ log2_path = "rom_delta_log_2_20250413_090649.txt"
 selection_path = "evolved_try_script.txt"
 output_path = "evolved_rom_try_script_output.txt"
 
-# Read in the logs
-with open(log1_path, 'r') as f:
-    log1_lines = f.readlines()
-
-with open(log2_path, 'r') as f:
-    log2_lines = f.readlines()
-
 # Read selection list
 with open(selection_path, 'r') as f:
     selections = [line.strip() for line in f if line.strip()]
 
 # Parse both logs into a dict: {(line_number, idx_number): line_text}
-delta_pattern = re.compile(r"Line (\d+):")
-
-def parse_log(lines):
-    log_data = {}
-    current_line = None
-    for line in lines:
-        match = delta_pattern.match(line)
-        if match:
-            current_line = int(match.group(1))
-        elif "idx" in line and current_line is not None:
-            idx_match = re.search(r"idx (\d+):", line)
-            if idx_match:
-                idx = int(idx_match.group(1))
-                log_data[(current_line, idx)] = line.strip()
-    return log_data
-
-log1_data = parse_log(log1_lines)
-log2_data = parse_log(log2_lines)
+log1_data = parse_delta_log(log1_path).text_map()
+log2_data = parse_delta_log(log2_path).text_map()
 
 # Merge based on selection
 result_lines = []
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import numpy as np
+
+from nibble_tracker import LOCK_VALUE
+
+# === FRONTIER INDEX ===
+# Bitset of locked nibbles packed into 64-bit words, plus a cursor on the
+# first word that still has a zero bit. Locks never come undone, so the
+# cursor only moves forward: finding the next unlocked nibble is a
+# "first zero bit" on the cursor word, amortized O(1) over a whole run.
+
+FULL_WORD = np.uint64(0xFFFFFFFFFFFFFFFF)
+SCAN_BLOCK = 1024
+
+class FrontierIndex:
+    def __init__(self, size, locked=None):
+        self.size = size
+        n_words = (size + 63) // 64
+        bits = np.ones(n_words * 64, dtype=bool)
+        bits[:size] = False if locked is None else locked
+        self.words = np.packbits(bits, bitorder="little").view("<u8").copy()
+        self.cursor = 0
+
+    @classmethod
+    def from_tracker(cls, tracker):
+        return cls(tracker.size, tracker.counts >= LOCK_VALUE)
+
+    def mark_locked(self, index):
+        index = np.asarray(index, dtype=np.uint64)
+        if len(index) == 0:
+            return
+        bits = np.left_shift(np.uint64(1), index & np.uint64(63))
+        np.bitwise_or.at(self.words, (index >> np.uint64(6)).astype(np.int64), bits)
+
+    def advance(self):
+        if self.cursor < len(self.words) and self.words[self.cursor] != FULL_WORD:
+            return True
+        # Look ahead a block at a time so a long locked run costs one
+        # vector compare per block rather than a rescan of the whole tail.
+        while self.cursor < len(self.words):
+            block = self.words[self.cursor:self.cursor + SCAN_BLOCK]
+            open_words = np.flatnonzero(block != FULL_WORD)
+            if len(open_words):
+                self.cursor += int(open_words[0])
+                return True
+            self.cursor += len(block)
+        return False
+
+    def next_unlocked(self):
+        if not self.advance():
+            return None
+        free = ~int(self.words[self.cursor]) & 0xFFFFFFFFFFFFFFFF
+        return self.cursor * 64 + (free & -free).bit_length() - 1
+
+    def unlocked_batch(self, count, window=None):
+        # The next `count` unlocked nibbles from the cursor on, optionally
+        # limited to the `window` nibbles starting at the first one.
+        start = self.next_unlocked()
+        if start is None:
+            return np.empty(0, dtype=np.int64)
+        stop = self.size if window is None else min(self.size, start + window)
+        found = []
+        remaining = count
+        word = self.cursor
+        while remaining > 0 and word * 64 < stop:
+            block = self.words[word:word + SCAN_BLOCK]
+            bits = np.unpackbits(block.view(np.uint8), bitorder="little")
+            free = np.flatnonzero(bits == 0)[:remaining] + word * 64
+            found.append(free)
+            remaining -= len(free)
+            word += len(block)
+        index = np.concatenate(found)
+        return index[index < stop]
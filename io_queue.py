@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+# === ORDERED BACKGROUND I/O ===
+# A bounded asyncio queue in front of a one-thread executor. The loop
+# submits blocking writes (roll log appends, ROM stores, tracker flushes)
+# and carries on computing; they run one at a time in submission order, so
+# anything written later never lands before something written earlier.
+# submit() waits once `depth` writes are queued, which keeps a fast loop
+# from running arbitrarily far ahead of the disk.
+
+class IoQueue:
+    def __init__(self, depth=4, metrics=None):
+        self.queue = asyncio.Queue(maxsize=depth)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="evolve-io")
+        # Optional LoopMetrics; each write is recorded under its stage name.
+        self.metrics = metrics
+        self.error = None
+        self.task = asyncio.get_running_loop().create_task(self.consume())
+
+    async def submit(self, stage, fn, *args):
+        if self.error is not None:
+            raise self.error
+        await self.queue.put((stage, fn, args))
+
+    async def consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            stage, fn, args = await self.queue.get()
+            try:
+                if self.metrics is not None:
+                    with self.metrics.time(stage):
+                        await loop.run_in_executor(self.executor, fn, *args)
+                else:
+                    await loop.run_in_executor(self.executor, fn, *args)
+            except Exception as e:
+                # Surfaced on the next submit() or on close().
+                if self.error is None:
+                    self.error = e
+            finally:
+                self.queue.task_done()
+
+    async def drain(self):
+        await self.queue.join()
+
+    async def close(self):
+        await self.drain()
+        self.task.cancel()
+        self.executor.shutdown(wait=True)
+        if self.error is not None:
+            raise self.error
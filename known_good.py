@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+import os
+
+import numpy as np
+
+# === KNOWN-GOOD ORACLE ===
+# The known-good ROM, memory-mapped once, with its hex characters unpacked
+# into a flat nibble array (index 2*b is byte b's high nibble, 2*b+1 its low
+# nibble) so the roll check, the tracker and the delta consumers all look
+# nibbles up by index instead of re-reading and re-formatting the ROM.
+
+HEX_DIGITS = "0123456789ABCDEF"
+
+class KnownGoodOracle:
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        self.size = len(self.data)
+        self.hex_chars = self.size * 2
+        self.nibble_array = np.empty(self.hex_chars, dtype=np.uint8)
+        self.nibble_array[0::2] = self.data >> 4
+        self.nibble_array[1::2] = self.data & 0x0F
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        return cls(path)
+
+    def nibble(self, i):
+        return int(self.nibble_array[i])
+
+    def nibbles(self, index):
+        return self.nibble_array[index]
+
+    def char(self, i):
+        return HEX_DIGITS[self.nibble_array[i]]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import os
+import struct
+
+import numpy as np
+
+from nibble_tracker import LOCK_VALUE
+
+# === LOCK COUNTERS ===
+# Running lock totals with two rollup levels: a "line" is 42 consecutive
+# nibbles and a "memory cube" is 42 lines. Kept in a memory-mapped file next
+# to the tracker and updated from the tracker's lock events, so nothing has
+# to recount the tracker to show progress.
+#
+#   magic "LCKC" | version u16 | reserved u16 | nibble count u64
+#   stats u64[3] (total, lines closed, cubes closed) | lines u8[] | cubes u16[]
+
+MAGIC = b"LCKC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+LINE_LENGTH = 42
+LINES_PER_CUBE = 42
+CUBE_SIZE = LINE_LENGTH * LINES_PER_CUBE
+
+def rollup_sizes(size):
+    n_lines = (size + LINE_LENGTH - 1) // LINE_LENGTH
+    n_cubes = (size + CUBE_SIZE - 1) // CUBE_SIZE
+    line_len = np.full(n_lines, LINE_LENGTH, dtype=np.int64)
+    cube_len = np.full(n_cubes, CUBE_SIZE, dtype=np.int64)
+    if size % LINE_LENGTH:
+        line_len[-1] = size % LINE_LENGTH
+    if size % CUBE_SIZE:
+        cube_len[-1] = size % CUBE_SIZE
+    return line_len, cube_len
+
+class LockCounters:
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.line_len, self.cube_len = rollup_sizes(size)
+        n_lines, n_cubes = len(self.line_len), len(self.cube_len)
+
+        fresh = not os.path.exists(path)
+        if not fresh:
+            with open(path, "rb") as f:
+                magic, version, _, count = HEADER.unpack(f.read(HEADER.size))
+            fresh = magic != MAGIC or version != VERSION or count != size
+        if fresh:
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0, size))
+                f.truncate(HEADER.size + 3 * 8 + n_lines + n_cubes * 2)
+
+        offset = HEADER.size
+        self.stats = np.memmap(path, dtype="<u8", mode="r+", offset=offset, shape=(3,))
+        offset += 3 * 8
+        self.lines = np.memmap(path, dtype=np.uint8, mode="r+", offset=offset, shape=(n_lines,))
+        offset += n_lines
+        self.cubes = np.memmap(path, dtype="<u2", mode="r+", offset=offset, shape=(n_cubes,))
+
+    @classmethod
+    def open(cls, path, tracker):
+        # The file is only trusted if it agrees with the tracker's lock total;
+        # otherwise (first run, crash between the two writes) it is rebuilt.
+        counters = cls(path, tracker.size)
+        if counters.total != tracker.locked_count():
+            counters.rebuild(tracker.counts >= LOCK_VALUE)
+        tracker.listeners.append(counters.add)
+        return counters
+
+    @property
+    def total(self):
+        return int(self.stats[0])
+
+    @property
+    def lines_closed(self):
+        return int(self.stats[1])
+
+    @property
+    def cubes_closed(self):
+        return int(self.stats[2])
+
+    def rebuild(self, locked):
+        index = np.flatnonzero(locked)
+        self.lines[:] = np.bincount(index // LINE_LENGTH, minlength=len(self.lines))
+        self.cubes[:] = np.bincount(index // CUBE_SIZE, minlength=len(self.cubes))
+        self.stats[0] = len(index)
+        self.stats[1] = np.count_nonzero(self.lines == self.line_len)
+        self.stats[2] = np.count_nonzero(self.cubes == self.cube_len)
+        self.flush()
+
+    def add(self, newly):
+        # newly holds distinct nibble indices that were unlocked until now.
+        lines, line_hits = np.unique(newly // LINE_LENGTH, return_counts=True)
+        cubes, cube_hits = np.unique(newly // CUBE_SIZE, return_counts=True)
+        self.lines[lines] += line_hits.astype(np.uint8)
+        self.cubes[cubes] += cube_hits.astype(np.uint16)
+        self.stats[0] += np.uint64(len(newly))
+        self.stats[1] += np.uint64(np.count_nonzero(self.lines[lines] == self.line_len[lines]))
+        self.stats[2] += np.uint64(np.count_nonzero(self.cubes[cubes] == self.cube_len[cubes]))
+
+    def flush(self):
+        self.stats.flush()
+        self.lines.flush()
+        self.cubes.flush()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import threading
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+# === LOOP METRICS ===
+# Cheap enough to leave on: a stage timing is two perf_counter calls and a
+# bisect into fixed histogram buckets, a counter is a dict add. Nothing is
+# written until export(), which the loop calls every `every` seconds:
+#
+#   <base>.json   stages (count, sum, max, p50/p90/p99), counters, window rate
+#   <base>.prom   the same in Prometheus text exposition format
+#
+# Percentiles come from the buckets, so they are upper bounds within a
+# factor of two — good enough to see which stage the time goes to.
+#
+# Stages may be recorded from other threads (the renderer's draw time);
+# adding a new stage and listing them for export share a lock.
+
+BUCKETS = [10e-6 * 2 ** k for k in range(24)]  # 10 µs .. ~84 s
+PERCENTILES = (50, 90, 99)
+PREFIX = "evolution"
+
+class StageHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+class LoopMetrics:
+    def __init__(self, base_path, every=10.0, window=60.0):
+        self.json_path = f"{base_path}.json"
+        self.prom_path = f"{base_path}.prom"
+        self.every = every
+        self.window = window
+        self.stages = {}
+        self.stages_lock = threading.Lock()
+        self.counters = {}
+        self.events = deque()
+        self.started = time.time()
+        self.last_export = time.monotonic()
+
+    # === Recording ===
+    @contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage, seconds):
+        hist = self.stages.get(stage)
+        if hist is None:
+            with self.stages_lock:
+                hist = self.stages.setdefault(stage, StageHistogram())
+        hist.add(seconds)
+
+    def stage_items(self):
+        with self.stages_lock:
+            return list(self.stages.items())
+
+    def inc(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def mark(self, n):
+        # Rolls finished just now, for the rolling throughput window.
+        now = time.monotonic()
+        self.events.append((now, n))
+        while self.events and now - self.events[0][0] > self.window:
+            self.events.popleft()
+
+    def rate(self):
+        if not self.events:
+            return 0.0
+        span = time.monotonic() - self.events[0][0]
+        total = sum(n for _, n in self.events)
+        return total / span if span > 0 else 0.0
+
+    # === Export ===
+    def snapshot(self):
+        return {
+            "started": self.started,
+            "timestamp": time.time(),
+            "window_seconds": self.window,
+            "window_rate": self.rate(),
+            "counters": dict(self.counters),
+            "stages": {
+                stage: {
+                    "count": hist.count,
+                    "sum": hist.sum,
+                    "max": hist.max,
+                    **{f"p{q}": hist.percentile(q) for q in PERCENTILES},
+                }
+                for stage, hist in self.stage_items()
+            },
+        }
+
+    def to_prometheus(self):
+        lines = [f"# TYPE {PREFIX}_stage_seconds histogram"]
+        for stage, hist in self.stage_items():
+            cumulative = 0
+            for bound, n in zip(BUCKETS, hist.buckets):
+                cumulative += n
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {hist.count}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{stage}"}} {hist.sum:.9g}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{stage}"}} {hist.count}')
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            lines.append(f"{PREFIX}_{name}_total {value}")
+        lines.append(f"# TYPE {PREFIX}_window_rate gauge")
+        lines.append(f"{PREFIX}_window_rate {self.rate():.6g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        for path, text in ((self.json_path, json.dumps(self.snapshot(), indent=2)),
+                           (self.prom_path, self.to_prometheus())):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        self.last_export = time.monotonic()
+
+    def maybe_export(self):
+        if self.every and time.monotonic() - self.last_export >= self.every:
+            self.export()
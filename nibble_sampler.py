@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import numpy as np
+
+# === WEIGHTED NIBBLE SAMPLER ===
+# Walker/Vose alias table over the 16 hex-digit weights: every draw is one
+# uniform column pick plus one biased coin, so a whole ROM's worth of
+# nibbles comes out of two vectorized calls on a seeded generator.
+
+HEX_KEYS = [f"{i:X}" for i in range(16)]
+
+class NibbleSampler:
+    def __init__(self, weights, seed=None, rng=None):
+        # weights: {"0": w0, ..., "F": w15} as stored in char_weights.json,
+        # or a sequence of 16 weights.
+        if isinstance(weights, dict):
+            weights = [weights[k] for k in HEX_KEYS]
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.prob, self.alias = self.build_alias(self.weights)
+
+    @staticmethod
+    def build_alias(weights):
+        n = len(weights)
+        scaled = weights * n / weights.sum()
+        prob = np.ones(n)
+        alias = np.arange(n, dtype=np.uint8)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        return prob, alias
+
+    def sample(self, count):
+        column = self.rng.integers(0, 16, size=count, dtype=np.uint8)
+        keep = self.rng.random(count) < self.prob[column]
+        return np.where(keep, column, self.alias[column])
+
+    def sample_bytes(self, count):
+        nibbles = self.sample(count * 2)
+        return ((nibbles[0::2] << 4) | nibbles[1::2]).astype(np.uint8).tobytes()
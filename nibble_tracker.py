@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import struct
+
+import numpy as np
+
+# === NIBBLE TRACKER STORE ===
+# One uint8 counter per hex character (2 per ROM byte), memory-mapped from a
+# small binary file:
+#
+#   magic "NIBT" | version u16 | reserved u16 | nibble count u64 | counters...
+#
+# Nibble i is byte i // 2, high nibble when i is even — the same position the
+# old JSON tracker spelled as "<byte>_hi" / "<byte>_lo".
+
+MAGIC = b"NIBT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+LOCK_VALUE = 15
+
+def key_to_index(key):
+    byte_index, half = key.split("_")
+    return int(byte_index) * 2 + (0 if half == "hi" else 1)
+
+def index_to_key(i):
+    return f"{i // 2}_hi" if i % 2 == 0 else f"{i // 2}_lo"
+
+class NibbleTracker:
+    def __init__(self, path, size):
+        self.path = path
+        if not os.path.exists(path):
+            self.create(path, size)
+
+        with open(path, "rb") as f:
+            magic, version, _, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a nibble tracker file")
+        if count != size:
+            raise ValueError(f"{path} tracks {count} nibbles, expected {size}")
+
+        self.size = count
+        self.counts = np.memmap(path, dtype=np.uint8, mode="r+", offset=HEADER.size, shape=(count,))
+        # Called with the array of nibble indices that just reached LOCK_VALUE.
+        self.listeners = []
+
+    @staticmethod
+    def create(path, size):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, size))
+            f.truncate(HEADER.size + size)
+
+    @classmethod
+    def open(cls, path, size, legacy_json=None):
+        # First run against an old project directory: carry the JSON over.
+        fresh = not os.path.exists(path)
+        tracker = cls(path, size)
+        if fresh and legacy_json and os.path.exists(legacy_json):
+            tracker.import_json(legacy_json)
+        return tracker
+
+    # === Lookups ===
+    def get(self, i):
+        return int(self.counts[i])
+
+    def is_locked(self, i):
+        return self.counts[i] >= LOCK_VALUE
+
+    def locked_count(self):
+        return int(np.count_nonzero(self.counts >= LOCK_VALUE))
+
+    # === Updates ===
+    def distinct(self, index):
+        # Sorted, de-duplicated indices. Dense batches (a full-ROM delta) go
+        # through a mask over the tracker, which beats sorting them.
+        index = np.asarray(index, dtype=np.int64)
+        if len(index) * 16 < self.size:
+            return np.unique(index)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[index] = True
+        return np.flatnonzero(mask)
+
+    def lock(self, index):
+        index = self.distinct(index)
+        newly = index[self.counts[index] < LOCK_VALUE]
+        self.counts[newly] = LOCK_VALUE
+        self.notify(newly)
+        return newly
+
+    def bump(self, index):
+        # One miss per nibble, repeated indices counting once. Misses stop one
+        # short of LOCK_VALUE: only a matching value ever locks a nibble.
+        index = self.distinct(index)
+        counts = self.counts[index]
+        below = counts < LOCK_VALUE - 1
+        self.counts[index[below]] = counts[below] + 1
+        return index[below]
+
+    def score(self, index, value, oracle):
+        # Nibbles a delta changed, with their new values: a value matching
+        # the known-good ROM locks, anything else is a miss.
+        in_range = index < min(oracle.hex_chars, self.size)
+        index, value = index[in_range], value[in_range]
+        hits = value == oracle.nibbles(index)
+        self.bump(index[~hits])
+        return self.lock(index[hits])
+
+    def merge(self, start, counts):
+        # Folds in counters for [start, start + len(counts)), e.g. a shard's
+        # slice. Counters only ever grow, so the larger value wins.
+        # Snapshot first: the source may be a shard file another process is
+        # still writing, and every lock applied below must also be notified.
+        counts = np.array(counts)
+        view = self.counts[start:start + len(counts)]
+        newly = start + np.flatnonzero((counts >= LOCK_VALUE) & (view < LOCK_VALUE))
+        np.maximum(view, counts, out=view)
+        self.notify(newly)
+        return newly
+
+    def notify(self, newly):
+        if len(newly):
+            for listener in self.listeners:
+                listener(newly)
+
+    def flush(self):
+        self.counts.flush()
+
+    # === JSON interchange ===
+    def import_json(self, path):
+        with open(path, "r") as f:
+            tracker = json.load(f)
+        for key, val in tracker.items():
+            if not (isinstance(val, int) and 0 <= val <= LOCK_VALUE and "_" in key):
+                continue
+            try:
+                i = key_to_index(key)
+            except ValueError:
+                continue
+            if 0 <= i < self.size:
+                self.counts[i] = val
+        self.flush()
+
+    def to_dict(self):
+        index = np.flatnonzero(self.counts)
+        return {index_to_key(i): v for i, v in zip(index.tolist(), self.counts[index].tolist())}
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5 or sys.argv[1] not in ("import", "export"):
+        print("Usage: nibble_tracker.py import|export <tracker.json> <tracker.bin> <nibble_count>")
+        sys.exit(1)
+
+    mode, json_path, bin_path, size = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+    tracker = NibbleTracker(bin_path, size)
+    if mode == "import":
+        tracker.import_json(json_path)
+        print(f"✅ Imported {json_path} → {bin_path} ({tracker.locked_count()} locked)")
+    else:
+        tracker.export_json(json_path)
+        print(f"✅ Exported {bin_path} → {json_path}")
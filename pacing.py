@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import time
+from collections import deque
+
+# === LOOP PACING ===
+# One Pacer per loop. The loop calls tick() after every iteration that did
+# work and idle() when it had nothing to do (waiting on input ROMs):
+#
+#   max        never sleeps after work; idle waits stay at the shortest step
+#   fixed      holds iterations to `rate` per second, on a deadline schedule
+#              so time spent working counts toward the interval
+#   adaptive   runs flat out while there is work; idle waits back off
+#              exponentially up to IDLE_MAX and reset on the next tick
+
+MODES = ("max", "fixed", "adaptive")
+IDLE_MIN = 0.05
+IDLE_MAX = 2.0
+RATE_WINDOW = 64  # iterations the achieved rate is measured over
+
+class Pacer:
+    def __init__(self, mode="adaptive", rate=4.0):
+        if mode not in MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}, expected one of {', '.join(MODES)}")
+        if mode == "fixed" and rate <= 0:
+            raise ValueError("fixed pacing needs a rate above 0")
+        self.mode = mode
+        self.rate = rate
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_deadline = None
+        self.idle_delay = IDLE_MIN
+        self.ticks = deque(maxlen=RATE_WINDOW)
+
+    @property
+    def target_rate(self):
+        return self.rate if self.mode == "fixed" else None
+
+    @property
+    def achieved_rate(self):
+        if len(self.ticks) < 2:
+            return 0.0
+        span = self.ticks[-1] - self.ticks[0]
+        return (len(self.ticks) - 1) / span if span > 0 else 0.0
+
+    def tick(self):
+        delay = self.tick_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+    def idle(self):
+        time.sleep(self.idle_delay_next())
+
+    def tick_delay(self):
+        # Records the tick and returns how long to wait; for callers that
+        # sleep their own way (asyncio.sleep).
+        now = time.monotonic()
+        self.ticks.append(now)
+        self.idle_delay = IDLE_MIN
+        if self.mode != "fixed":
+            return 0.0
+        if self.next_deadline is None or now - self.next_deadline > self.interval:
+            # First tick, or far behind schedule: don't burst to catch up.
+            self.next_deadline = now
+        self.next_deadline += self.interval
+        return self.next_deadline - now
+
+    def idle_delay_next(self):
+        if self.mode == "fixed":
+            delay = self.interval
+        else:
+            delay = self.idle_delay
+            if self.mode == "adaptive":
+                self.idle_delay = min(self.idle_delay * 2, IDLE_MAX)
+        self.next_deadline = None
+        return delay
+
+    def describe(self):
+        achieved = f"{self.achieved_rate:.1f} it/s"
+        if self.target_rate is None:
+            return f"{self.mode}: {achieved}"
+        return f"{self.mode}: {achieved} of {self.target_rate:g} target"
+
+def add_pacing_args(parser, default_rate=4.0):
+    parser.add_argument("--pace", choices=MODES, default="adaptive",
+                        help="max: never sleep, fixed: hold --rate, adaptive: back off only while idle (default)")
+    parser.add_argument("--rate", type=float, default=default_rate, metavar="HZ",
+                        help=f"iterations per second for --pace fixed (default: {default_rate:g})")
+
+def pacer_from_args(args):
+    return Pacer(args.pace, args.rate)
@@ -1,18 +1,14 @@
 #!/usr/bin/env python3
+import os
 import sys
-import re
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from delta_parser import parse_delta_log
+
 def parse_log(path):
-    deltas = {}
-    with open(path, "r") as f:
-        for line in f:
-            match = re.match(r"0x([0-9A-Fa-f]+): .*Δ (\d+)", line)
-            if match:
-                offset = int(match.group(1), 16)
-                delta = int(match.group(2))
-                deltas[offset] = delta
-    return deltas
+    # {offset: delta} from a binary or text delta log.
+    return parse_delta_log(path).offset_map()
 
 def main(log1, log2, output_file):
     deltas1 = parse_log(log1)
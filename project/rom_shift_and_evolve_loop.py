@@ -1,30 +1,67 @@
 #!/usr/bin/env python3
 import os
+import sys
 import time
+import argparse
 import subprocess
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from evolution_pipeline import EvolutionPipeline
+    from nibble_tracker import NibbleTracker
+    from lock_counters import LockCounters
+    from known_good import KnownGoodOracle
+except ImportError:
+    EvolutionPipeline = None
+try:
+    from rom_index import RomIndex, new_rom_name
+except ImportError:
+    RomIndex = None
+try:
+    from pacing import Pacer, add_pacing_args, pacer_from_args
+except ImportError:
+    Pacer = None
+
 # === CONFIGURATION ===
 ROM_DIR = os.path.expanduser("~/evolved_roms")
 KNOWN_GOOD_ROM = os.path.join(ROM_DIR, "known_good_rom.bin")
 TRACKER_JSON = os.path.join(ROM_DIR, "byte_tracker.json")
+TRACKER_BIN = os.path.join(ROM_DIR, "byte_tracker.bin")
+COUNTS_FILE = os.path.join(ROM_DIR, "byte_tracker.counts")
 EVOLVE_SCRIPT = os.path.join(ROM_DIR, "evolve_try_script_from_deltas_compared.py")
-DELTA_LOG = os.path.join(ROM_DIR, "delta_log_latest.txt")
+DELTA_BIN = os.path.join(ROM_DIR, "delta_latest.bin")
 TRY_SCRIPT = os.path.join(ROM_DIR, "evolved_try_script.txt")
-SLEEP_SECONDS = 2
+SLEEP_SECONDS = 2  # per-iteration sleep when pacing.py is unavailable
 CLOSURE_LIMIT = 15
 
 # === TRACKERS ===
+# Only used by the subprocess fallback; the in-process pipeline reads the
+# persisted LockCounters next to the tracker instead.
 closed_characters = 0
 line_length = 42
 lines_closed = 0
 frames_closed = 0
 
 # === HELPERS ===
+_rom_index = None
+
+def get_rom_index():
+    global _rom_index
+    if _rom_index is None and RomIndex is not None:
+        _rom_index = RomIndex(ROM_DIR)
+    return _rom_index
+
 def get_latest_roms():
-    roms = sorted([f for f in os.listdir(ROM_DIR) if f.endswith(".bin")])
+    # Only evolved_rom_*.bin are candidates; known_good_rom.bin and
+    # starting_rom.bin sort in among them by name but are never compared.
+    index = get_rom_index()
+    if index is not None:
+        return index.latest_two()
+    roms = sorted([f for f in os.listdir(ROM_DIR) if f.startswith("evolved_rom_") and f.endswith(".bin")],
+                  key=lambda f: os.path.getmtime(os.path.join(ROM_DIR, f)))
     full_paths = [os.path.join(ROM_DIR, f) for f in roms]
-    return full_paths[-2:] if len(full_paths) >= 2 else (None, None)
+    return (full_paths[-2], full_paths[-1]) if len(full_paths) >= 2 else (None, None)
 
 def count_hex_chars(file_path):
     with open(file_path, "rb") as f:
@@ -33,32 +70,75 @@ def count_hex_chars(file_path):
 def compute_delta(rom1, rom2):
     result = subprocess.run(["python3", "rom_delta_logger.py", rom1, rom2], capture_output=True, text=True)
     if result.returncode == 0:
-        print("✅ Delta log written to", DELTA_LOG)
+        print("✅ Delta written to", DELTA_BIN)
     else:
         print("❌ Delta log failure")
     return result.returncode == 0
 
 def evolve_rom():
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    new_rom_path = os.path.join(ROM_DIR, f"evolved_rom_{timestamp}.bin")
-    result = subprocess.run(["python3", EVOLVE_SCRIPT, DELTA_LOG, DELTA_LOG, TRY_SCRIPT], capture_output=True, text=True)
+    if RomIndex is not None:
+        new_rom_path = os.path.join(ROM_DIR, new_rom_name())
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        new_rom_path = os.path.join(ROM_DIR, f"evolved_rom_{timestamp}.bin")
+    result = subprocess.run(["python3", EVOLVE_SCRIPT, DELTA_BIN, DELTA_BIN, TRY_SCRIPT], capture_output=True, text=True)
     print(result.stdout.strip())
     with open(new_rom_path, "wb") as f:
         f.write(os.urandom(512 * 1024))
+    if get_rom_index() is not None:
+        get_rom_index().add(new_rom_path)
     print(f"✅ New evolved ROM written: {new_rom_path}")
     return new_rom_path
 
 def update_byte_tracker():
-    subprocess.run(["python3", "byte_evolution_tracker.py", DELTA_LOG, KNOWN_GOOD_ROM, TRACKER_JSON])
+    subprocess.run(["python3", "byte_evolution_tracker.py", DELTA_BIN, KNOWN_GOOD_ROM, TRACKER_JSON])
+
+# === IN-PROCESS STEP (subprocess helpers above are the fallback) ===
+def run_step(pipeline, older_rom, newer_rom):
+    if pipeline is None:
+        if not compute_delta(older_rom, newer_rom):
+            return "delta_failed"
+        if not (os.path.exists(DELTA_BIN) and os.path.getsize(DELTA_BIN) > 0):
+            return "empty_delta"
+        evolve_rom()
+        update_byte_tracker()
+        return "ok"
+
+    if not pipeline.compute_delta(older_rom, newer_rom):
+        print("❌ Delta failure")
+        return "delta_failed"
+    print(f"✅ Delta computed: {len(pipeline.offsets)} bytes differ, sum {pipeline.delta_sum}")
+    new_rom_path = pipeline.evolve()
+    print(f"✅ New evolved ROM written: {new_rom_path}")
+    pipeline.update_tracker()
+    return "ok"
+
+def report_closures(counters, before):
+    total, lines, cubes = before
+    counters.flush()
+    if counters.lines_closed > lines:
+        print(f"🎉 Line complete! {counters.lines_closed} lines closed.")
+    if counters.cubes_closed > cubes:
+        print(f"🧊 Small cube complete! {counters.cubes_closed} memory cubes etched.")
+    print(f"🎯 Hex characters closed: +{counters.total - total} (total {counters.total})")
+
+def pause(pacer, idle=False):
+    if pacer is None:
+        time.sleep(SLEEP_SECONDS)
+    elif idle:
+        pacer.idle()
+    else:
+        pacer.tick()
+        print(f"🚦 Pacing {pacer.describe()}")
 
 # === MAIN LOOP ===
-def run_loop():
+def run_loop(pacer=None):
     global closed_characters, lines_closed, frames_closed
 
     print("🔁 Starting ROM evolution loop...")
 
     roms = get_latest_roms()
-    if not roms or len(roms) < 2:
+    if roms[-1] is None:
         print("❌ Not enough ROMs to begin.")
         return
 
@@ -66,24 +146,35 @@ def run_loop():
     total_hex_chars = count_hex_chars(base_rom)
     total_iterations = total_hex_chars * CLOSURE_LIMIT
 
+    pipeline = None
+    counters = None
+    if EvolutionPipeline is not None:
+        tracker = NibbleTracker.open(TRACKER_BIN, total_hex_chars, legacy_json=TRACKER_JSON)
+        counters = LockCounters.open(COUNTS_FILE, tracker)
+        pipeline = EvolutionPipeline(ROM_DIR, KnownGoodOracle.load(KNOWN_GOOD_ROM), tracker, DELTA_BIN, TRY_SCRIPT,
+                                      rom_index=get_rom_index())
+
     for i in range(1, total_iterations + 1):
         print(f"\n▶️ Iteration [{i}/{total_iterations}]")
 
         older_rom, newer_rom = get_latest_roms()
-        if not compute_delta(older_rom, newer_rom):
+        before = (counters.total, counters.lines_closed, counters.cubes_closed) if counters else None
+        status = run_step(pipeline, older_rom, newer_rom)
+        if status == "delta_failed":
             print("⚠️ Skipping evolution due to delta failure.")
-            time.sleep(SLEEP_SECONDS)
+            pause(pacer, idle=True)
             continue
-
-        if os.path.exists(DELTA_LOG) and os.path.getsize(DELTA_LOG) > 0:
-            evolve_rom()
-        else:
-            print("❌ Delta log missing or empty.")
+        if status == "empty_delta":
+            print("❌ Delta missing or empty.")
+            pause(pacer, idle=True)
             continue
 
-        update_byte_tracker()
-
         # === Closure tracking ===
+        if counters is not None:
+            report_closures(counters, before)
+            pause(pacer)
+            continue
+
         closed_characters += 1
         if closed_characters % line_length == 0:
             lines_closed += 1
@@ -94,7 +185,12 @@ def run_loop():
             print(f"🧊 Small cube complete! {frames_closed} memory cubes etched.")
 
         print(f"🎯 Hex character closed! Total closed: {closed_characters}")
-        time.sleep(SLEEP_SECONDS)
+        pause(pacer)
 
 if __name__ == "__main__":
-    run_loop()
+    pacer = None
+    if Pacer is not None:
+        parser = argparse.ArgumentParser(description="ROM shift and evolve loop")
+        add_pacing_args(parser, default_rate=1.0 / SLEEP_SECONDS)
+        pacer = pacer_from_args(parser.parse_args())
+    run_loop(pacer)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+import os
+import sys
+import glob
+import json
+import time
+from datetime import datetime
+
+import numpy as np
+
+# === APPEND-ONLY ROLL LOG ===
+# Every dice roll is one fixed-width 17-byte record:
+#
+#   timestamp (µs since epoch) i64 | nibble offset u64 | good << 4 | roll  u8
+#
+# Records are appended to numbered segment files (dice_roll_log.000000.bin,
+# ...), and a new segment is started once the current one holds
+# SEGMENT_RECORDS rolls. Nothing is ever rewritten, so an append costs the
+# same on the first roll and the billionth.
+
+RECORD = np.dtype([("timestamp", "<i8"), ("offset", "<u8"), ("nibbles", "u1")])
+SEGMENT_RECORDS = 1 << 20
+HEX_DIGITS = "0123456789ABCDEF"
+
+class RollLog:
+    def __init__(self, base_path, segment_records=SEGMENT_RECORDS):
+        # base_path is the log name without extension, e.g. .../dice_roll_log
+        self.base_path = base_path
+        self.segment_records = segment_records
+        self.segments = sorted(glob.glob(f"{base_path}.[0-9][0-9][0-9][0-9][0-9][0-9].bin"))
+        if not self.segments:
+            self.segments = [self.segment_path(0)]
+        self.counts = [os.path.getsize(p) // RECORD.itemsize if os.path.exists(p) else 0
+                       for p in self.segments]
+        # Unbuffered: each append is a single write(2), so a killed loop
+        # loses nothing that was already logged.
+        self.file = open(self.segments[-1], "ab", buffering=0)
+        # Drop a record torn by a crash mid-write so later appends stay aligned.
+        self.file.truncate(self.counts[-1] * RECORD.itemsize)
+
+    def segment_path(self, n):
+        return f"{self.base_path}.{n:06d}.bin"
+
+    def __len__(self):
+        return sum(self.counts)
+
+    # === Writing ===
+    def append(self, offset, good, roll):
+        self.append_many([offset], [good], [roll])
+
+    def append_many(self, offsets, goods, rolls, timestamps=None):
+        records = np.empty(len(offsets), dtype=RECORD)
+        records["timestamp"] = time.time_ns() // 1000 if timestamps is None else timestamps
+        records["offset"] = offsets
+        records["nibbles"] = (np.asarray(goods, dtype=np.uint8) << 4) | np.asarray(rolls, dtype=np.uint8)
+        self.write_records(records)
+
+    def write_records(self, records):
+        start = 0
+        while start < len(records):
+            room = self.segment_records - self.counts[-1]
+            if room == 0:
+                self.rotate()
+                continue
+            chunk = records[start:start + room]
+            self.file.write(chunk.tobytes())
+            self.counts[-1] += len(chunk)
+            start += len(chunk)
+
+    def import_json(self, path):
+        # Carries over the entries kept by the old dice_roll_log.json.
+        with open(path, "r") as f:
+            entries = json.load(f)
+        rows = []
+        for entry in entries:
+            try:
+                offset = entry["offset"]
+                rows.append((
+                    int(offset, 16) if isinstance(offset, str) else int(offset),
+                    int(entry["good_char"], 16),
+                    int(entry["roll"], 16),
+                    int(datetime.fromisoformat(entry["timestamp"]).timestamp() * 1_000_000),
+                ))
+            except (KeyError, ValueError, TypeError):
+                continue
+        if rows:
+            offsets, goods, rolls, stamps = zip(*rows)
+            self.append_many(offsets, goods, rolls, timestamps=stamps)
+
+    def rotate(self):
+        self.file.close()
+        self.segments.append(self.segment_path(len(self.segments)))
+        self.counts.append(0)
+        self.file = open(self.segments[-1], "ab", buffering=0)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    # === Reading ===
+    def read_range(self, start, stop):
+        self.flush()
+        stop = min(stop, len(self))
+        parts = []
+        first = 0
+        for path, count in zip(self.segments, self.counts):
+            lo, hi = max(start, first), min(stop, first + count)
+            if lo < hi:
+                parts.append(np.memmap(path, dtype=RECORD, mode="r", shape=(count,))[lo - first:hi - first])
+            first += count
+        if not parts:
+            return np.empty(0, dtype=RECORD)
+        return np.concatenate(parts)
+
+    def tail(self, n):
+        total = len(self)
+        return self.read_range(max(0, total - n), total)
+
+def to_entries(records):
+    # Same shape as the old dice_roll_log.json entries, for humans and tools.
+    entries = []
+    for ts, offset, nibbles in zip(records["timestamp"].tolist(), records["offset"].tolist(),
+                                   records["nibbles"].tolist()):
+        entries.append({
+            "timestamp": datetime.fromtimestamp(ts / 1_000_000).isoformat(),
+            "offset": offset,
+            "good_char": HEX_DIGITS[nibbles >> 4],
+            "roll": HEX_DIGITS[nibbles & 0x0F],
+        })
+    return entries
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: roll_log.py <log base path> [count]")
+        sys.exit(1)
+
+    log = RollLog(sys.argv[1])
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else 20
+    for entry in to_entries(log.tail(count)):
+        print(f"{entry['timestamp']}  0x{entry['offset']:06X}  good {entry['good_char']}  roll {entry['roll']}")
+    print(f"📜 {len(log):,} rolls in {len(log.segments)} segment(s)")
@@ -1,44 +1,112 @@
 #!/usr/bin/env python3
 import sys
 import os
-from datetime import datetime
+import hashlib
+
+import numpy as np
+
+from delta_format import DeltaLog, DeltaWriter, rom_hash, trailing_region, read_delta, export_text
+
+CHUNK_SIZE = 4 * 1024 * 1024  # bytes of each input compared per streaming step
+
+def load_rom(path):
+    return np.fromfile(path, dtype=np.uint8)
+
+def map_rom(path):
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+def compute_delta_arrays(b1, b2):
+    # Returns the total |b1 - b2| plus only the offsets that actually differ,
+    # with their old/new byte values. Only the common prefix is compared.
+    common = min(len(b1), len(b2))
+    b1, b2 = b1[:common], b2[:common]
+    diff = np.abs(b1.astype(np.int16) - b2.astype(np.int16))
+    offsets = np.flatnonzero(diff)
+    delta_sum = int(diff.sum(dtype=np.int64))
+    return delta_sum, offsets, b1[offsets], b2[offsets]
+
+def report_trailing(size1, size2):
+    region = trailing_region(size1, size2)
+    if region is not None:
+        kind, start, length = region
+        print(f"↔️ ROM sizes differ: trailing {kind} of {length} bytes at 0x{start:04X}.")
+    return region
 
 def compute_delta_sum(file1, file2):
-    with open(file1, "rb") as f1, open(file2, "rb") as f2:
-        b1 = f1.read()
-        b2 = f2.read()
-        if len(b1) != len(b2):
-            print("❌ ROM sizes differ, cannot compute delta.")
-            return 0, []
+    b1 = load_rom(file1)
+    b2 = load_rom(file2)
+    report_trailing(len(b1), len(b2))
+    return compute_delta_arrays(b1, b2)
 
-        delta_sum = 0
-        diffs = []
+# === Streaming ===
+def iter_delta_chunks(file1, file2, chunk_size=CHUNK_SIZE, hashers=None):
+    # Both inputs are mapped, never read whole; each step touches at most
+    # chunk_size bytes of each. Yields (delta_sum, offsets, old, new) with
+    # absolute 64-bit offsets as soon as a chunk is done. With a pair of
+    # hashers, each file's bytes are fed to its hasher on the same pass,
+    # including the trailing region of the longer one.
+    b1 = map_rom(file1)
+    b2 = map_rom(file2)
+    common = min(len(b1), len(b2))
+    for start in range(0, common, chunk_size):
+        stop = min(start + chunk_size, common)
+        chunk1, chunk2 = b1[start:stop], b2[start:stop]
+        if hashers is not None:
+            hashers[0].update(chunk1)
+            hashers[1].update(chunk2)
+        delta_sum, offsets, old, new = compute_delta_arrays(chunk1, chunk2)
+        yield delta_sum, offsets + start, old, new
+    if hashers is not None:
+        for h, data in zip(hashers, (b1, b2)):
+            for start in range(common, len(data), chunk_size):
+                h.update(data[start:start + chunk_size])
 
-        for i in range(len(b1)):
-            diff = abs(b1[i] - b2[i])
-            delta_sum += diff
-            diffs.append((i, b1[i], b2[i], diff))
+def stream_delta(file1, file2, path, chunk_size=CHUNK_SIZE, on_chunk=None):
+    # Writes the binary delta while scanning; on_chunk(delta_sum, offsets,
+    # old, new) lets a caller start on each chunk before the scan finishes.
+    size1, size2 = os.path.getsize(file1), os.path.getsize(file2)
+    report_trailing(size1, size2)
+    writer = DeltaWriter(path, size1, size2)
+    hashers = (hashlib.blake2b(digest_size=16), hashlib.blake2b(digest_size=16))
+    for chunk in iter_delta_chunks(file1, file2, chunk_size, hashers):
+        writer.write(*chunk)
+        if on_chunk is not None:
+            on_chunk(*chunk)
+    writer.close(hashers[0].digest(), hashers[1].digest())
+    return writer.delta_sum, writer.count
 
-        return delta_sum, diffs
+def build_delta(b1, b2):
+    delta_sum, offsets, old, new = compute_delta_arrays(b1, b2)
+    return DeltaLog(delta_sum, offsets, old, new, len(b1), len(b2), rom_hash(b1), rom_hash(b2))
+
+def compute_delta_log_and_sum(rom1, rom2, log_path, text=False):
+    # Writes the binary delta (or the old text log with text=True).
+    if not text:
+        delta_sum, _ = stream_delta(rom1, rom2, log_path)
+        return delta_sum
+    b1 = load_rom(rom1)
+    b2 = load_rom(rom2)
+    report_trailing(len(b1), len(b2))
+    delta = build_delta(b1, b2)
+    export_text(delta, log_path)
+    return delta.delta_sum
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: rom_delta_logger.py <rom1> <rom2>")
+    if len(sys.argv) not in (3, 4) or (len(sys.argv) == 4 and sys.argv[3] != "--text"):
+        print("Usage: rom_delta_logger.py <rom1> <rom2> [--text]")
         sys.exit(1)
 
     rom1_path = sys.argv[1]
     rom2_path = sys.argv[2]
 
-    delta_sum, diffs = compute_delta_sum(rom1_path, rom2_path)
-
-    # Auto-generate output filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"delta_log_latest.txt"
+    log_filename = "delta_latest.bin"
 
-    with open(log_filename, "w") as f:
-        f.write(f"Delta Sum: {delta_sum}\n")
-        for index, b1, b2, diff in diffs:
-            if diff > 0:
-                f.write(f"0x{index:04X}: {b1:02X} -> {b2:02X} (Δ {diff})\n")
+    delta_sum, count = stream_delta(rom1_path, rom2_path, log_filename)
+    print(f"✅ Delta written to {os.path.abspath(log_filename)} with sum {delta_sum} ({count} bytes differ)")
 
-    print(f"✅ Delta log written to {os.path.abspath(log_filename)} with sum {delta_sum}")
+    if len(sys.argv) == 4:
+        text_filename = "delta_log_latest.txt"
+        export_text(read_delta(log_filename), text_filename)
+        print(f"📝 Text log written to {os.path.abspath(text_filename)}")
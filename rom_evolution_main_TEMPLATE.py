@@ -3,10 +3,13 @@
 # === SCRIPT: rom_evolution_main_20250413_1633.py ===
 # Master automation to evolve ROMs by comparing two delta logs and generating the next try script.
 
-import re
 from datetime import datetime
 import subprocess
 
+import numpy as np
+
+from delta_parser import parse_delta_log, MISSING
+
 # === INPUT FILES ===
 log1_path = "rom_delta_log_1_20250413_090649.txt"
 log2_path = "rom_delta_log_2_20250413_090649.txt"
@@ -14,38 +17,25 @@ delta_report_path = "evolved_rom_try_script_output.txt"
 selection_output_path = "evolved_try_script.txt"
 
 # === CONFIG ===
-delta_pattern = re.compile(r"idx (\d+):.*?\((\d+)\).*?\((\d+)\).*?→ Δ Notch = (\d+)")
 idx_per_line = 40  # Assumes 40 indices per line
 
-# Read the delta report
-with open(delta_report_path, "r") as f:
-    delta_lines = f.readlines()
+# Read the delta report; only entries carrying both log values and a notch count
+report = parse_delta_log(delta_report_path)
+full = (report.left != MISSING) & (report.right != MISSING) & (report.notches != MISSING)
+texts = [text for text, keep in zip(report.texts, full.tolist()) if keep]
+line_nums = 1 + np.arange(len(texts)) // idx_per_line
+use_log1 = report.left[full] <= report.right[full]
 
 # Group delta lines by line number and choose lower-delta entry
 selection_lines = []
-line_num = 1
-idx_count = 0
-
-for line in delta_lines:
-    match = delta_pattern.search(line)
-    if match:
-        idx_str, log1_val, log2_val, delta = match.groups()
-        idx = int(idx_str)
-        delta = int(delta)
-        chosen_log = "use_log1" if int(log1_val) <= int(log2_val) else "use_log2"
-        if "Δ Notch = 0" in line:
-            chosen_log = "# match"
-
-        # Write selection or match comment
-        if chosen_log.startswith("use"):
-            selection_lines.append(f"{line_num:03d} {idx:02d} {chosen_log}")
-        else:
-            selection_lines.append(f"# {line.strip()}")
-
-        idx_count += 1
-        if idx_count == idx_per_line:
-            idx_count = 0
-            line_num += 1
+for line_num, idx, notch, first, text in zip(line_nums.tolist(), report.idx[full].tolist(),
+                                             report.notches[full].tolist(), use_log1.tolist(), texts):
+    # Write selection or match comment
+    if notch == 0:
+        selection_lines.append(f"# {text}")
+    else:
+        chosen_log = "use_log1" if first else "use_log2"
+        selection_lines.append(f"{line_num:03d} {idx:02d} {chosen_log}")
 
 # Write new selection file
 with open(selection_output_path, "w") as f:
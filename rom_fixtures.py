@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import os
+import argparse
+
+import numpy as np
+
+from nibble_tracker import NibbleTracker, LOCK_VALUE
+from rom_delta_logger import stream_delta
+from delta_format import read_delta, export_text
+
+# === SYNTHETIC ROM FIXTURES ===
+# Self-contained stand-ins for an ~/evolved_roms project, for benchmarks
+# and experiments:
+#
+#   known_good_rom.bin            random image
+#   evolved_rom_0.bin             known good with `density` of its bytes changed
+#   evolved_rom_1.bin             evolved_rom_0 with `density` of its bytes changed
+#   byte_tracker.bin              `fill` of all nibbles locked, the rest 0..14
+#   delta_latest.bin / .txt       delta evolved_rom_0 → evolved_rom_1
+#
+# Everything is drawn from one seeded generator, so a (size, density, fill,
+# seed) tuple always produces the same files.
+
+def parse_size(text):
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def format_size(size):
+    for unit, scale in (("G", 1024 ** 3), ("M", 1024 ** 2), ("K", 1024)):
+        if size >= scale and size % scale == 0:
+            return f"{size // scale}{unit}"
+    return str(size)
+
+def make_rom(size, rng):
+    return rng.integers(0, 256, size=size, dtype=np.uint8)
+
+def mutate(rom, density, rng):
+    # About density * size bytes differ (duplicate draws collapse); XOR with
+    # 1..255 guarantees every drawn byte really changes.
+    out = rom.copy()
+    offsets = np.unique(rng.integers(0, len(rom), size=int(round(density * len(rom)))))
+    out[offsets] ^= rng.integers(1, 256, size=len(offsets), dtype=np.uint8)
+    return out
+
+def make_counts(nibbles, fill, rng):
+    # 16-bit thresholds keep a 64 MB ROM's worth of draws at 2 bytes each.
+    counts = rng.integers(0, LOCK_VALUE, size=nibbles, dtype=np.uint8)
+    counts[rng.integers(0, 1 << 16, size=nibbles, dtype=np.uint16) < fill * (1 << 16)] = LOCK_VALUE
+    return counts
+
+def write_fixture(directory, size, density=0.01, fill=0.5, seed=0, text_log=True):
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = {
+        "known_good": os.path.join(directory, "known_good_rom.bin"),
+        "older": os.path.join(directory, "evolved_rom_0.bin"),
+        "newer": os.path.join(directory, "evolved_rom_1.bin"),
+        "tracker": os.path.join(directory, "byte_tracker.bin"),
+        "delta": os.path.join(directory, "delta_latest.bin"),
+        "delta_text": os.path.join(directory, "delta_log_latest.txt"),
+    }
+
+    good = make_rom(size, rng)
+    older = mutate(good, density, rng)
+    newer = mutate(older, density, rng)
+    good.tofile(paths["known_good"])
+    older.tofile(paths["older"])
+    newer.tofile(paths["newer"])
+
+    if os.path.exists(paths["tracker"]):
+        os.remove(paths["tracker"])
+    tracker = NibbleTracker(paths["tracker"], size * 2)
+    tracker.counts[:] = make_counts(size * 2, fill, rng)
+    tracker.flush()
+    del tracker
+
+    stream_delta(paths["older"], paths["newer"], paths["delta"])
+    if text_log:
+        export_text(read_delta(paths["delta"]), paths["delta_text"])
+    return paths
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic ROM fixture directory")
+    parser.add_argument("directory")
+    parser.add_argument("--size", default="512K", help="ROM size, e.g. 64K, 1M, 64M (default: 512K)")
+    parser.add_argument("--density", type=float, default=0.01,
+                        help="fraction of bytes changed between consecutive ROMs (default: 0.01)")
+    parser.add_argument("--fill", type=float, default=0.5,
+                        help="fraction of tracker nibbles already locked (default: 0.5)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = write_fixture(args.directory, parse_size(args.size), args.density, args.fill, args.seed)
+    print(f"✅ Fixture written to {os.path.abspath(args.directory)}:")
+    for name, path in paths.items():
+        print(f"   {name:<11} {os.path.basename(path)}")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import os
+import sys
+import struct
+import hashlib
+from datetime import datetime
+
+import numpy as np
+
+# === ROM HISTORY STORE ===
+# Every evolved ROM becomes a numbered generation instead of its own
+# evolved_rom_<timestamp>.bin. Images are content-addressed by hash, so a
+# repeated image is stored once, and each one is kept either as a full
+# keyframe or as a sparse patch (offsets + new bytes) against the keyframe
+# it was diffed with:
+#
+#   <root>/objects/<hash>.rom     full image
+#   <root>/objects/<hash>.patch   "RPAT" | version u16 | reserved u16 | size u64
+#                                 | count u64 | keyframe hash (16 bytes)
+#                                 | offsets u32[count] | values u8[count]
+#   <root>/generations.txt        one "<generation> <hash> <timestamp>" line each
+#
+# Materializing any generation reads at most one keyframe plus one patch.
+
+PATCH_MAGIC = b"RPAT"
+PATCH_VERSION = 1
+PATCH_HEADER = struct.Struct("<4sHHQQ16s")
+# A patch costs 5 bytes per changed byte; past this share of the image a
+# fresh keyframe is smaller and becomes the base for the following patches.
+KEYFRAME_RATIO = 0.2
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class RomHistory:
+    def __init__(self, root):
+        self.root = root
+        self.objects = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "generations.txt")
+        os.makedirs(self.objects, exist_ok=True)
+
+        self.hashes = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        self.hashes.append(parts[1])
+        # Generations whose objects are on disk; staged ones are only cached.
+        self.persisted = len(self.hashes)
+
+        self.keyframe_hash = None
+        self.keyframe = None
+        self.cache = {}
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def name(self, generation):
+        return f"generation {generation:06d}"
+
+    def object_path(self, h, kind):
+        return os.path.join(self.objects, f"{h}.{kind}")
+
+    # === Writing ===
+    def add(self, data):
+        generation, persist = self.stage(data)
+        persist()
+        return generation
+
+    def stage(self, data):
+        # Registers the generation in memory right away and returns the disk
+        # writes as a callable, so they can run later (in order) off the
+        # caller's thread. Until then the image is served from the cache.
+        rom = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray)) else data
+        h = content_hash(rom.tobytes())
+        generation = len(self.hashes)
+        stamp = datetime.now().isoformat()
+        self.hashes.append(h)
+        self.remember(generation, rom)
+
+        def persist():
+            if not (os.path.exists(self.object_path(h, "rom")) or os.path.exists(self.object_path(h, "patch"))):
+                self.store(h, rom)
+            with open(self.index_path, "a") as f:
+                f.write(f"{generation} {h} {stamp}\n")
+            self.persisted = generation + 1
+
+        return generation, persist
+
+    def store(self, h, rom):
+        base = self.current_keyframe()
+        if base is not None and len(base) == len(rom):
+            offsets = np.flatnonzero(base != rom)
+            if len(offsets) <= KEYFRAME_RATIO * len(rom) and len(rom) <= 0xFFFFFFFF:
+                with open(self.object_path(h, "patch"), "wb") as f:
+                    f.write(PATCH_HEADER.pack(PATCH_MAGIC, PATCH_VERSION, 0, len(rom), len(offsets),
+                                              bytes.fromhex(self.keyframe_hash)))
+                    f.write(offsets.astype("<u4").tobytes())
+                    f.write(rom[offsets].tobytes())
+                return
+
+        with open(self.object_path(h, "rom"), "wb") as f:
+            f.write(rom.tobytes())
+        self.keyframe_hash, self.keyframe = h, rom
+
+    def current_keyframe(self):
+        # After a restart the newest keyframe is found by walking back from
+        # the latest generation; it is then kept in memory.
+        if self.keyframe is None and self.persisted:
+            h = self.hashes[self.persisted - 1]
+            if not os.path.exists(self.object_path(h, "rom")):
+                h = self.read_patch_header(h)[2]
+            self.keyframe_hash, self.keyframe = h, self.read_full(h)
+        return self.keyframe
+
+    def import_file(self, path):
+        return self.add(np.fromfile(path, dtype=np.uint8))
+
+    # === Reading ===
+    def read_full(self, h):
+        return np.fromfile(self.object_path(h, "rom"), dtype=np.uint8)
+
+    def read_patch_header(self, h):
+        with open(self.object_path(h, "patch"), "rb") as f:
+            magic, version, _, size, count, base = PATCH_HEADER.unpack(f.read(PATCH_HEADER.size))
+        if magic != PATCH_MAGIC or version != PATCH_VERSION:
+            raise ValueError(f"{h}.patch is not a ROM patch")
+        return size, count, base.hex()
+
+    def materialize_hash(self, h):
+        if os.path.exists(self.object_path(h, "rom")):
+            return self.read_full(h)
+
+        size, count, base_hash = self.read_patch_header(h)
+        base = self.keyframe if base_hash == self.keyframe_hash else self.read_full(base_hash)
+        raw = np.fromfile(self.object_path(h, "patch"), dtype=np.uint8, offset=PATCH_HEADER.size)
+        offsets = raw[:count * 4].view("<u4")
+        rom = base.copy()
+        rom[offsets] = raw[count * 4:count * 5]
+        return rom
+
+    def materialize(self, generation):
+        rom = self.cache.get(generation)
+        if rom is None:
+            rom = self.materialize_hash(self.hashes[generation])
+            self.remember(generation, rom)
+        return rom
+
+    def remember(self, generation, rom):
+        # The loop only ever compares the newest pair.
+        self.cache[generation] = rom
+        for old in [g for g in self.cache if g < len(self.hashes) - 2]:
+            del self.cache[old]
+
+    def latest_two(self):
+        if len(self.hashes) < 2:
+            return None, None
+        return len(self.hashes) - 2, len(self.hashes) - 1
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "export":
+        print("Usage: rom_history.py export <history dir> <generation>")
+        sys.exit(1)
+
+    history = RomHistory(sys.argv[2])
+    generation = int(sys.argv[3])
+    if generation < 0:
+        generation += len(history)
+    out_path = f"evolved_rom_gen{generation:06d}.bin"
+    history.materialize(generation).tofile(out_path)
+    print(f"✅ Wrote {history.name(generation)} to {os.path.abspath(out_path)}")
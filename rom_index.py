@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+
+# === ROM DIRECTORY INDEX ===
+# Append-only list of the evolved_rom_*.bin files in one directory, oldest
+# first, so "latest two" is a lookup instead of a listdir + stat + sort per
+# loop tick:
+#
+#   <dir>/rom_index.txt   one file name per line, in the order written
+#
+# Writers call add() right after saving a ROM. Other processes appending to
+# the same index are picked up by reading whatever was added past the last
+# known end of the file. A missing index is rebuilt once from a scandir pass,
+# ordered by modification time; known_good_rom.bin, starting_rom.bin and
+# anything else not named evolved_rom_*.bin is never listed.
+
+INDEX_NAME = "rom_index.txt"
+ROM_PREFIX = "evolved_rom_"
+ROM_SUFFIX = ".bin"
+
+def is_evolved_rom(name):
+    return name.startswith(ROM_PREFIX) and name.endswith(ROM_SUFFIX)
+
+_last_stamp = 0
+
+def new_rom_name():
+    # evolved_rom_<YYYYmmdd_HHMMSS>_<nanoseconds>.bin. Loops unpaced by
+    # pacing.py write many ROMs a second; the nanosecond part (never reused
+    # within a process) keeps them from overwriting each other.
+    global _last_stamp
+    _last_stamp = max(time.time_ns(), _last_stamp + 1)
+    seconds, nanos = divmod(_last_stamp, 10**9)
+    return f"{ROM_PREFIX}{time.strftime('%Y%m%d_%H%M%S', time.localtime(seconds))}_{nanos:09d}{ROM_SUFFIX}"
+
+class RomIndex:
+    def __init__(self, directory, index_path=None):
+        self.directory = str(directory)
+        self.index_path = index_path or os.path.join(self.directory, INDEX_NAME)
+        self.names = []
+        self.known = set()
+        self.read_pos = 0
+        if os.path.exists(self.index_path):
+            self.refresh()
+        else:
+            self.rebuild()
+
+    def __len__(self):
+        self.refresh()
+        return len(self.names)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    # === Writing ===
+    def rebuild(self):
+        with os.scandir(self.directory) as it:
+            entries = [(e.stat().st_mtime, e.name) for e in it if e.is_file() and is_evolved_rom(e.name)]
+        entries.sort()
+        self.write_names([name for _, name in entries])
+
+    def write_names(self, names):
+        self.names = names
+        self.known = set(names)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("".join(f"{name}\n" for name in self.names))
+        os.replace(tmp_path, self.index_path)
+        self.read_pos = os.path.getsize(self.index_path)
+
+    def add(self, path):
+        self.refresh()
+        name = os.path.basename(str(path))
+        if self.names and self.names[-1] == name:
+            return
+        if name in self.known:
+            # Rewritten under an old name: it is the newest ROM now. Rare,
+            # so the whole index is rewritten rather than appended to.
+            self.write_names([n for n in self.names if n != name] + [name])
+            return
+        with open(self.index_path, "a") as f:
+            f.write(f"{name}\n")
+        self.names.append(name)
+        self.known.add(name)
+        self.read_pos = os.path.getsize(self.index_path)
+
+    # === Reading ===
+    def refresh(self):
+        # One stat per call; only lines appended since the last read are parsed.
+        if os.path.getsize(self.index_path) == self.read_pos:
+            return
+        with open(self.index_path, "r") as f:
+            f.seek(self.read_pos)
+            chunk = f.read()
+        # A line still being written by another process is left for next time.
+        complete = chunk[:chunk.rfind("\n") + 1]
+        added = [line for line in complete.splitlines() if line]
+        self.names.extend(added)
+        self.known.update(added)
+        self.read_pos += len(complete.encode())
+
+    def newest(self, count):
+        # The last `count` distinct names, oldest first. Another process may
+        # have appended a name that is already listed.
+        names = []
+        for name in reversed(self.names):
+            if name not in names:
+                names.append(name)
+                if len(names) == count:
+                    break
+        return [self.path(name) for name in reversed(names)]
+
+    def latest(self, count):
+        self.refresh()
+        latest = self.newest(count)
+        if not all(os.path.exists(p) for p in latest):
+            # Someone deleted ROMs behind the index's back.
+            self.rebuild()
+            latest = self.newest(count)
+        return latest
+
+    def latest_two(self):
+        latest = self.latest(2)
+        return (latest[0], latest[1]) if len(latest) == 2 else (None, None)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: rom_index.py <rom_dir>")
+        sys.exit(1)
+
+    index = RomIndex(sys.argv[1])
+    index.rebuild()
+    print(f"✅ Indexed {len(index)} ROMs in {index.index_path}")
@@ -2,29 +2,30 @@
 import os
 import time
 import shutil
+import numpy as np
 from datetime import datetime
 from rom_delta_logger import compute_delta_log_and_sum
 from evolve_try_script_autoweight import evolve_try_script
+from rom_index import RomIndex, new_rom_name
+from try_patch import load_patch, apply_patch
 
 EVOLVED_DIR = os.path.expanduser("~/evolved_roms")
 ITERATIONS = 50
 SLEEP_SECONDS = 5
+TRY_SCRIPT = "evolved_try_script.txt"
 
-def get_sorted_roms():
-    roms = sorted([
-        os.path.join(EVOLVED_DIR, f) for f in os.listdir(EVOLVED_DIR)
-        if f.endswith(".bin")
-    ])
-    return roms[-2:] if len(roms) >= 2 else []
+def get_sorted_roms(index):
+    return index.latest(2)
 
 def timestamp():
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 def run_loop():
     print("🔁 Starting ROM evolution loop...")
+    index = RomIndex(EVOLVED_DIR)
     for iteration in range(1, ITERATIONS + 1):
         print(f"\n▶️ [{iteration}/{ITERATIONS}] Checking evolved_roms/ directory...")
-        roms = get_sorted_roms()
+        roms = get_sorted_roms(index)
         if len(roms) < 2:
             print("❌ Need at least two ROMs to compute delta.")
             break
@@ -34,7 +35,7 @@ def run_loop():
         print(f"📂 Newer ROM:  {newer_rom}")
 
         # Step 1: Compute delta and delta sum
-        delta_path = f"delta_log_{iteration}.txt"
+        delta_path = f"delta_{iteration}.bin"
         delta_sum = compute_delta_log_and_sum(older_rom, newer_rom, delta_path)
         if delta_sum is None:
             print("⚠️ Could not parse delta sum.")
@@ -43,20 +44,20 @@ def run_loop():
 
         # Step 2: Evolve try script using deltas
         print("🔁 Evolving try script from delta logs (weighted)...")
-        evolve_try_script(delta_path, delta_path, "evolved_try_script.txt")
+        evolve_try_script(delta_path, delta_path, TRY_SCRIPT)
 
         # Step 3: Generate new ROM based on evolved script
-        with open(newer_rom, "rb") as f:
-            data = bytearray(f.read())
-        for line in open("evolved_try_script.txt"):
-            if line.startswith("#") or not line.strip():
-                continue
-            try:
-                offset, value = line.strip().split()
-                data[int(offset, 0)] = int(value, 16)
-            except Exception as e:
-                print(f"⚠️ Skipped line: {line.strip()} — {e}")
-                continue
+        patch = load_patch(TRY_SCRIPT)
+        data = np.fromfile(newer_rom, dtype=np.uint8)
+        written = apply_patch(data, patch)
+        if patch.skipped:
+            print(f"⚠️ Skipped {patch.skipped} unsupported lines in {TRY_SCRIPT}")
+        out_path = os.path.join(EVOLVED_DIR, new_rom_name())
+        tmp_path = f"{out_path}.tmp"
+        data.tofile(tmp_path)
+        os.replace(tmp_path, out_path)
+        index.add(out_path)
+        print(f"🧬 Patched {written} bytes → {out_path}")
 
 if __name__ == "__main__":
     run_loop()
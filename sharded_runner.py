@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import queue
+import argparse
+import multiprocessing as mp
+
+import numpy as np
+
+import byte_evolution_tracker as bet
+from nibble_tracker import NibbleTracker
+from frontier_index import FrontierIndex
+from known_good import KnownGoodOracle
+from roll_log import RollLog
+from nibble_roller import roll_batch, commit_rolls
+from tried_mask import TriedMask
+
+# === SHARDED EVOLUTION RUNNER ===
+# Nibble positions are independent, so the nibble space is cut into one
+# contiguous range per worker process. Each worker owns a tracker file for
+# its range (and its own roll log) and runs the batch roll loop on it; the
+# parent folds every reported slice into the global tracker, which keeps the
+# frontier, lock counters and snapshot current.
+
+SHARD_DIR = os.path.join(bet.PROJECT_DIR, "shards")
+WORKER_POLL = 1.0  # seconds between liveness checks while waiting on results
+
+def plan_shards(size, workers):
+    bounds = np.linspace(0, size, workers + 1).astype(np.int64)
+    # Keep shard edges on byte boundaries so a byte's two nibbles stay together.
+    bounds[1:-1] &= ~1
+    return [
+        {
+            "id": n,
+            "start": int(bounds[n]),
+            "stop": int(bounds[n + 1]),
+            "size": size,
+            "tracker": os.path.join(SHARD_DIR, f"byte_tracker_shard{n:02d}.bin"),
+            "roll_log": os.path.join(SHARD_DIR, f"dice_roll_log_shard{n:02d}"),
+        }
+        for n in range(workers)
+    ]
+
+def open_shard_tracker(spec, global_tracker):
+    size = spec["stop"] - spec["start"]
+    try:
+        tracker = NibbleTracker(spec["tracker"], size)
+    except ValueError:
+        # Left over from a run with a different worker count.
+        os.remove(spec["tracker"])
+        tracker = NibbleTracker(spec["tracker"], size)
+    tracker.merge(0, global_tracker.counts[spec["start"]:spec["stop"]])
+    tracker.flush()
+    return tracker
+
+# === WORKER ===
+def shard_worker(spec, batch_size, rounds, seed, results, stop_event):
+    start, stop = spec["start"], spec["stop"]
+    tracker = NibbleTracker(spec["tracker"], stop - start)
+    # The shared tried mask, mapped over this shard's range only.
+    tried = TriedMask(bet.TRIED_FILE, spec["size"], start, stop - start)
+    frontier = FrontierIndex.from_tracker(tracker)
+    tracker.listeners.append(frontier.mark_locked)
+    good_slice = KnownGoodOracle(bet.KNOWN_GOOD_ROM).nibble_array[start:stop].copy()
+    roll_log = RollLog(spec["roll_log"])
+    rng = np.random.default_rng(seed)
+
+    done = False
+    while not done and not stop_event.is_set():
+        began = time.perf_counter()
+        rolled = hit_count = 0
+        for _ in range(rounds):
+            index = frontier.unlocked_batch(batch_size)
+            if len(index) == 0:
+                done = True
+                break
+            good = good_slice[index]
+            rolls, hits = roll_batch(rng, good, tried.bits[index])
+            roll_log.append_many(index + start, good, rolls)
+            commit_rolls(tracker, tried, index, rolls, hits)
+            rolled += len(index)
+            hit_count += int(hits.sum())
+        tracker.flush()
+        tried.flush()
+        results.put((spec["id"], rolled, hit_count, done, time.perf_counter() - began))
+    roll_log.close()
+
+# === PARENT: MERGE + PROGRESS ===
+def check_workers(procs):
+    # A worker that died would otherwise leave the parent waiting on results
+    # forever. Workers only exit cleanly once done or told to stop.
+    for n, proc in enumerate(procs):
+        if proc.exitcode not in (None, 0):
+            raise RuntimeError(f"shard worker {n} exited with code {proc.exitcode}")
+
+def run_sharded(workers, batch_size, rounds, snapshot_every):
+    if bet.ORACLE is None:
+        raise RuntimeError(f"known-good ROM not found: {bet.KNOWN_GOOD_ROM}")
+    tracker = bet.get_tracker()
+    counters = bet.get_counters()
+    bet.get_frontier()
+    # Created up front; workers map their slices of it.
+    bet.get_tried().flush()
+    os.makedirs(SHARD_DIR, exist_ok=True)
+
+    specs = plan_shards(tracker.size, workers)
+    shard_trackers = [open_shard_tracker(spec, tracker) for spec in specs]
+    for spec, shard in zip(specs, shard_trackers):
+        tracker.merge(spec["start"], shard.counts)
+    tracker.flush()
+
+    results = mp.Queue()
+    stop_event = mp.Event()
+    seeds = np.random.SeedSequence().spawn(workers)
+    procs = [
+        mp.Process(target=shard_worker, args=(spec, batch_size, rounds, seed, results, stop_event), daemon=True)
+        for spec, seed in zip(specs, seeds)
+    ]
+    for proc in procs:
+        proc.start()
+
+    print(f"🧩 {workers} shards × batch {batch_size:,} over {tracker.size:,} nibbles")
+    started = time.time()
+    last_snapshot = started
+    # Carried on from the checkpoint, like run_loop.
+    attempts = bet.get_checkpoints().attempts
+    rolled_here = 0
+    finished = set()
+    try:
+        while len(finished) < workers:
+            try:
+                shard_id, rolled, hit_count, done, _ = results.get(timeout=WORKER_POLL)
+            except queue.Empty:
+                check_workers(procs)
+                continue
+            spec = specs[shard_id]
+            tracker.merge(spec["start"], shard_trackers[shard_id].counts)
+            attempts += rolled
+            rolled_here += rolled
+            if done:
+                finished.add(shard_id)
+
+            now = time.time()
+            if now - last_snapshot >= snapshot_every or len(finished) == workers:
+                tracker.flush()
+                counters.flush()
+                bet.checkpoint(attempts, force=True)
+                last_snapshot = now
+
+            rate = rolled_here / (now - started) if now > started else 0
+            sys.stdout.write(
+                f"\r🔒 {counters.total:,}/{tracker.size:,} locked | 🎉 {counters.lines_closed:,} lines"
+                f" | 🧊 {counters.cubes_closed:,} cubes | ⚡ {rate:,.0f} rolls/sec"
+                f" | ✅ {len(finished)}/{workers} shards done "
+            )
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for proc in procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for spec, shard in zip(specs, shard_trackers):
+            tracker.merge(spec["start"], shard.counts)
+        tracker.flush()
+        counters.flush()
+        bet.checkpoint(attempts, force=True)
+    print(f"\n✅ {counters.total:,}/{tracker.size:,} nibbles locked after {attempts:,} rolls ({rolled_here:,} this run)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the evolution loop sharded across processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=4096, metavar="K",
+                        help="nibbles each worker rolls per round (default: 4096)")
+    parser.add_argument("--rounds", type=int, default=64,
+                        help="rounds a worker runs between merges (default: 64)")
+    parser.add_argument("--snapshot-every", type=float, default=10.0, metavar="SECONDS",
+                        help="minimum time between progress snapshots (default: 10)")
+    args = parser.parse_args()
+    try:
+        run_sharded(args.workers, args.batch, args.rounds, args.snapshot_every)
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import sys
+import time
+import shutil
+import threading
+
+# === TERMINAL RENDERER ===
+# The loop only publishes its latest state (one reference swap); a daemon
+# thread turns that into output at most max_fps times a second, however
+# fast the loop itself runs. TerminalRenderer rewrites only the lines that
+# changed since the last frame; HeadlessRenderer prints one stats line
+# every few seconds instead, for runs nobody is watching.
+
+CLEAR_SCREEN = "\033[2J\033[H"
+CLEAR_LINE = "\033[K"
+WIDTH_EVERY = 1.0  # seconds between terminal size lookups
+
+def move_to(row):
+    return f"\033[{row + 1};1H"
+
+class Renderer:
+    def __init__(self, interval, out=None, metrics=None):
+        self.interval = interval
+        self.out = out or sys.stdout
+        # Optional LoopMetrics; draw time is recorded as the "render" stage.
+        self.metrics = metrics
+        self.state = None
+        self.drawn_state = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def update(self, state):
+        # Called from the loop; never blocks on terminal I/O.
+        self.state = state
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            state = self.state
+            if state is not None and state is not self.drawn_state:
+                if self.metrics is not None:
+                    with self.metrics.time("render"):
+                        self.draw(state)
+                else:
+                    self.draw(state)
+                self.drawn_state = state
+
+    def close(self):
+        # Stops the thread and draws whatever the loop published last.
+        self.stop_event.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        if self.state is not None and self.state is not self.drawn_state:
+            self.draw(self.state)
+            self.drawn_state = self.state
+
+    def draw(self, state):
+        raise NotImplementedError
+
+class TerminalRenderer(Renderer):
+    def __init__(self, format_frame, max_fps=10, out=None, metrics=None):
+        # format_frame(state, width) -> list of lines
+        super().__init__(1.0 / max_fps, out, metrics)
+        self.format_frame = format_frame
+        self.lines = []
+        self.width = None
+        self.width_checked = 0.0
+
+    def get_width(self):
+        now = time.monotonic()
+        if self.width is None or now - self.width_checked >= WIDTH_EVERY:
+            try:
+                self.width = shutil.get_terminal_size().columns
+            except:
+                self.width = 80
+            self.width_checked = now
+        return self.width
+
+    def draw(self, state):
+        width = self.width
+        lines = self.format_frame(state, self.get_width())
+        if width != self.width:
+            # Centered lines all move on a resize; start from a clean screen.
+            self.lines = []
+            parts = [CLEAR_SCREEN]
+        else:
+            parts = []
+        for row, line in enumerate(lines):
+            if row >= len(self.lines) or self.lines[row] != line:
+                parts.append(move_to(row) + line + CLEAR_LINE)
+        for row in range(len(lines), len(self.lines)):
+            parts.append(move_to(row) + CLEAR_LINE)
+        parts.append(move_to(len(lines)))
+        self.lines = lines
+        self.out.write("".join(parts))
+        self.out.flush()
+
+class HeadlessRenderer(Renderer):
+    def __init__(self, format_line, every=5.0, out=None, metrics=None):
+        # format_line(state) -> one line, printed every `every` seconds.
+        super().__init__(every, out, metrics)
+        self.format_line = format_line
+
+    def draw(self, state):
+        self.out.write(f"[{time.strftime('%H:%M:%S')}] {self.format_line(state)}\n")
+        self.out.flush()
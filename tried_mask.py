@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import os
+import sys
+import struct
+
+import numpy as np
+
+# === TRIED MASK ===
+# One 16-bit mask per nibble: bit v is set once hex digit v has been rolled
+# there and missed. The good digit is never set, so once 15 bits are set
+# the last clear bit is the answer and the nibble can be confirmed without
+# another roll. Memory-mapped beside the tracker:
+#
+#   magic "TRYM" | version u16 | reserved u16 | nibble count u64 | masks u16[]
+#
+# Shard workers map just their own range (start, count), so concurrent
+# writers never touch the same bytes.
+
+MAGIC = b"TRYM"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+ALL_TRIED = 0xFFFF
+CONFIRM_AT = 15  # eliminated values that leave a single candidate
+POPCOUNT = np.array([bin(m).count("1") for m in range(1 << 16)], dtype=np.uint8)
+
+class TriedMask:
+    def __init__(self, path, size, start=0, count=None):
+        self.path = path
+        if not os.path.exists(path):
+            self.create(path, size)
+
+        with open(path, "rb") as f:
+            magic, version, _, total = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a tried-mask file")
+        if total != size:
+            raise ValueError(f"{path} tracks {total} nibbles, expected {size}")
+
+        count = size - start if count is None else count
+        self.size = count
+        self.bits = np.memmap(path, dtype="<u2", mode="r+", offset=HEADER.size + 2 * start, shape=(count,))
+
+    @staticmethod
+    def create(path, size):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, size))
+            f.truncate(HEADER.size + 2 * size)
+
+    def eliminate(self, index, values):
+        # Marks `values` as wrong at `index`. Returns (newly, confirmed):
+        # indices where a value was ruled out for the first time, and those
+        # now down to a single candidate.
+        index = np.asarray(index, dtype=np.int64)
+        if len(index) == 0:
+            return index, index
+        bit = np.left_shift(np.uint16(1), np.asarray(values, dtype=np.uint16))
+        before = self.bits[index]
+        fresh = (before & bit) == 0
+        index, bit = index[fresh], bit[fresh]
+        # A batch holds each nibble at most once, but stay safe on repeats.
+        np.bitwise_or.at(self.bits, index, bit)
+        newly = np.unique(index)
+        confirmed = newly[POPCOUNT[self.bits[newly]] >= CONFIRM_AT]
+        return newly, confirmed
+
+    def flush(self):
+        self.bits.flush()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: tried_mask.py <tracker.tried> <nibble_count>")
+        sys.exit(1)
+
+    mask = TriedMask(sys.argv[1], int(sys.argv[2]))
+    eliminated = POPCOUNT[mask.bits].astype(np.int64)
+    print(f"🎲 {int(eliminated.sum()):,} values ruled out over {mask.size:,} nibbles")
+    print(f"🧮 {int(np.count_nonzero(eliminated)):,} nibbles narrowed, "
+          f"{int(np.count_nonzero(eliminated >= CONFIRM_AT)):,} down to one candidate")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import struct
+
+import numpy as np
+
+from delta_format import offset_width
+
+# === COMPILED TRY-SCRIPT PATCHES ===
+# Try scripts come in a few text dialects:
+#
+#   0x0000:12            offset (any base) ":" value in decimal
+#                        (evolve_try_script_from_deltas_compared.py, EvolutionPipeline)
+#   1234 0C              offset (any base) and value in hex
+#                        (evolve_try_script_autoweight.py)
+#   001 02 use_log1      selection lines; they point into delta logs rather
+#                        than at bytes, so they're counted as skipped
+#
+# Any of them compiles to one binary patch, sorted by offset with the last
+# write to an offset winning, cached next to the script:
+#
+#   magic "TPAT" | version u16 | offset width u8 | reserved u8 | count u64
+#   | skipped lines u64 | source mtime ns u64 | source size u64
+#   | offsets u32/u64[count] | values u8[count]
+#
+# The cache is reused while the script's mtime and size are unchanged.
+
+MAGIC = b"TPAT"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBQQQQ")
+
+COLON_LINE = re.compile(r"^\s*(0[xX][0-9A-Fa-f]+|\d+)\s*:\s*(\d+)\s*$")
+PAIR_LINE = re.compile(r"^\s*(0[xX][0-9A-Fa-f]+|\d+)\s+([0-9A-Fa-f]{1,2})\s*$")
+
+class Patch:
+    def __init__(self, offsets, values, skipped=0):
+        self.offsets = offsets
+        self.values = values
+        self.skipped = skipped
+
+    def __len__(self):
+        return len(self.offsets)
+
+def finalize(offsets, values, skipped):
+    # Sort by offset, keeping the last value written to each one, as a
+    # line-by-line apply would.
+    offsets = np.asarray(offsets, dtype=np.uint64)
+    values = np.asarray(values, dtype=np.uint8)
+    if len(offsets):
+        rev_offsets = offsets[::-1]
+        uniq, first = np.unique(rev_offsets, return_index=True)
+        offsets, values = uniq, values[::-1][first]
+    return Patch(offsets, values, skipped)
+
+def parse_offset(text):
+    return int(text, 16) if text[:2] in ("0x", "0X") else int(text)
+
+def compile_try_script(path):
+    offsets, values, skipped = [], [], 0
+    with open(path, "r") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            m = COLON_LINE.match(line)
+            if m:
+                value = int(m.group(2))
+            else:
+                m = PAIR_LINE.match(line)
+                if not m:
+                    skipped += 1
+                    continue
+                value = int(m.group(2), 16)
+            if value > 0xFF:
+                skipped += 1
+                continue
+            offsets.append(parse_offset(m.group(1)))
+            values.append(value)
+    return finalize(offsets, values, skipped)
+
+# === Writing ===
+HEX_CHARS = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+def format_colon_script(offsets, values):
+    # The "0x%04X:%d" dialect as bytes, without a Python string per line:
+    # line lengths give each line's start, then every character column is
+    # scattered into one output buffer for all lines at once.
+    values = np.asarray(values, dtype=np.uint16)
+    if len(values) == 0:
+        return b""
+    top = int(np.max(offsets))
+    width = max(4, (top.bit_length() + 3) // 4)
+    dtype = np.uint32 if top <= 0xFFFFFFFF else np.uint64
+    offsets = np.asarray(offsets).astype(dtype, copy=False)
+
+    # Hex digits per offset (at least 4) and decimal digits per value.
+    hex_len = np.full(len(offsets), 4, dtype=np.int64)
+    for k in range(4, width):
+        hex_len += offsets >= (dtype(1) << dtype(4 * k))
+    dec_len = 1 + (values >= 10) + (values >= 100)
+    line_len = 2 + hex_len + 1 + dec_len + 1
+    ends = np.cumsum(line_len)
+    starts = ends - line_len
+
+    out = np.empty(int(ends[-1]), dtype=np.uint8)
+    out[starts] = ord("0")
+    out[starts + 1] = ord("x")
+    colon = starts + 2 + hex_len
+    for k in range(width):
+        # k-th hex digit from the right; only offsets that long have one.
+        rows = hex_len > k
+        digit = (offsets[rows] >> dtype(4 * k)) & dtype(0xF)
+        out[(colon - 1 - k)[rows]] = HEX_CHARS[digit.astype(np.intp)]
+    out[colon] = ord(":")
+    newline = colon + 1 + dec_len
+    for k in range(3):
+        rows = dec_len > k
+        out[(newline - 1 - k)[rows]] = (values[rows] // 10 ** k) % 10 + ord("0")
+    out[newline] = ord("\n")
+    return out.tobytes()
+
+# === Cache file ===
+def write_patch(path, patch, mtime_ns=0, source_size=0):
+    width = offset_width(int(patch.offsets[-1]) if len(patch) else 0)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, 0, len(patch), patch.skipped, mtime_ns, source_size))
+        f.write(patch.offsets.astype(f"<u{width}").tobytes())
+        f.write(patch.values.tobytes())
+    os.replace(tmp_path, path)
+
+def read_patch(path):
+    # (patch, source mtime ns, source size)
+    with open(path, "rb") as f:
+        magic, version, width, _, count, skipped, mtime_ns, source_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a compiled try-script patch")
+        offsets = np.fromfile(f, dtype=f"<u{width}", count=count).astype(np.uint64)
+        values = np.fromfile(f, dtype=np.uint8, count=count)
+    if len(offsets) != count or len(values) != count:
+        raise ValueError(f"{path} is truncated")
+    return Patch(offsets, values, skipped), mtime_ns, source_size
+
+def load_patch(script_path, cache_path=None):
+    # The compiled patch for script_path, recompiled only when it changed.
+    cache_path = cache_path or f"{script_path}.patch"
+    st = os.stat(script_path)
+    if os.path.exists(cache_path):
+        try:
+            patch, mtime_ns, source_size = read_patch(cache_path)
+            if mtime_ns == st.st_mtime_ns and source_size == st.st_size:
+                return patch
+        except (ValueError, struct.error):
+            pass
+    patch = compile_try_script(script_path)
+    write_patch(cache_path, patch, st.st_mtime_ns, st.st_size)
+    return patch
+
+# === Applying ===
+def apply_patch(rom_buffer, patch):
+    # One scatter into a writable buffer (bytearray, memoryview or uint8
+    # array). Offsets past the end are dropped; returns the bytes written.
+    rom = rom_buffer if isinstance(rom_buffer, np.ndarray) else np.frombuffer(rom_buffer, dtype=np.uint8)
+    in_range = patch.offsets < len(rom)
+    offsets = patch.offsets[in_range].astype(np.int64)
+    rom[offsets] = patch.values[in_range]
+    return len(offsets)
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 4):
+        print("Usage: try_patch.py <try_script.txt> [<rom_in.bin> <rom_out.bin>]")
+        sys.exit(1)
+
+    patch = load_patch(sys.argv[1])
+    print(f"🧩 {len(patch)} patched bytes, {patch.skipped} lines skipped")
+    if len(sys.argv) == 4:
+        rom = np.fromfile(sys.argv[2], dtype=np.uint8)
+        written = apply_patch(rom, patch)
+        rom.tofile(sys.argv[3])
+        print(f"✅ Wrote {os.path.abspath(sys.argv[3])} ({written} bytes patched)")